@@ -2,8 +2,8 @@
 
 from benchrun.benchmark import benchmark
 from benchrun.runner import BenchmarkRunner
-from benchrun.results import BenchmarkResults
+from benchrun.results import BenchmarkResults, ResultsDict
 from benchrun.display import print_comparison
 
 __version__ = "0.2.0"
-__all__ = ["benchmark", "BenchmarkRunner", "BenchmarkResults", "print_comparison"]
\ No newline at end of file
+__all__ = ["benchmark", "BenchmarkRunner", "BenchmarkResults", "ResultsDict", "print_comparison"]
\ No newline at end of file
@@ -0,0 +1,24 @@
+"""Subprocess entry point for isolated benchmark runs.
+
+BenchmarkRunner(isolate=True) starts a fresh interpreter per run with
+``python -c "from benchrun._worker import main; main()"``, writes a pickled
+``(func, runs, warmup, auto_calibrate, target_sample_time, ops_per_call)`` tuple to its
+stdin and reads back from its stdout a JSON object holding the durations
+in seconds and the batch size they were timed with.
+"""
+
+import json
+import pickle
+import sys
+
+from benchrun.benchmark import _measure
+
+
+def main() -> None:
+    """Run one benchmark described on stdin and write durations to stdout."""
+    func, runs, warmup, auto_calibrate, target_sample_time, ops_per_call = pickle.loads(
+        sys.stdin.buffer.read())
+    durations, _, _, batch_size = _measure(func, runs, warmup, auto_calibrate,
+                                           target_sample_time,
+                                           ops_per_call=ops_per_call)
+    json.dump({"durations": durations.tolist(), "batch_size": batch_size}, sys.stdout)
@@ -1,19 +1,477 @@
 """Core benchmarking functionality."""
 
+import gc
+import itertools
+import logging
+import operator
+import os
+import sys
 import time
-from typing import Callable, List
+from array import array
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Iterator, Optional, Sequence, Tuple
 
+logger = logging.getLogger(__name__)
 
-def benchmark(func: Callable, runs: int = 100, warmup: int = 0) -> List[float]:
+# Switch interval (seconds) used while timing: long enough that the
+# interpreter never asks the running thread to drop the GIL mid-run
+_QUIET_SWITCH_INTERVAL = 3600.0
+
+
+# Source for the warmup and timed loops. Like timeit.template, the loops
+# are generated and compiled once so the timer is a fast local and the
+# loop body contains nothing but the call being measured. Durations are
+# written in place into a preallocated integer array (int64 unless the
+# caller picks another typecode), so the loop neither grows a list nor
+# keeps a boxed int object per run. A sample too large for a narrower
+# typecode makes _widen switch the buffer to int64 and carry on; the
+# store happens after the timer is read, outside the timed region.
+_LOOP_TEMPLATE = """
+def _warmup_loop(func, n):
+    for _ in range(n):
+        func()
+
+def _timed_loop(func, n, typecode="q", _timer=_timer, _array=_array):
+    durations = _array(typecode, [0]) * n
+    for i in range(n):
+        start = _timer()
+        func()
+        elapsed = _timer() - start
+        try:
+            durations[i] = elapsed
+        except OverflowError:
+            durations = _widen(durations, i, elapsed)
+    return durations
+
+def _batched_loop(func, n, inner, typecode="q", _timer=_timer, _repeat=_repeat,
+                  _array=_array):
+    durations = _array(typecode, [0]) * n
+    for i in range(n):
+        batch = _repeat(None, inner)
+        start = _timer()
+        for _ in batch:
+            func()
+        elapsed = _timer() - start
+        try:
+            durations[i] = elapsed
+        except OverflowError:
+            durations = _widen(durations, i, elapsed)
+    return durations
+
+def _interleaved_loop(funcs, n, typecode="q", _timer=_timer, _array=_array):
+    buffers = [_array(typecode, [0]) * n for _ in funcs]
+    pairs = list(zip(funcs, buffers))
+    for i in range(n):
+        for func, durations in pairs:
+            start = _timer()
+            func()
+            durations[i] = _timer() - start
+    return buffers
+
+def _flushed_loop(func, n, flush, typecode="q", _timer=_timer, _array=_array):
+    durations = _array(typecode, [0]) * n
+    for i in range(n):
+        flush()
+        start = _timer()
+        func()
+        elapsed = _timer() - start
+        try:
+            durations[i] = elapsed
+        except OverflowError:
+            durations = _widen(durations, i, elapsed)
+    return durations
+"""
+
+
+def _widen(durations: Sequence[int], index: int, elapsed: int) -> Sequence[int]:
+    """Copy a compact duration buffer to int64 and store the sample that overflowed it."""
+    logger.warning("A sample exceeded the %d-bit nanosecond range; "
+                   "continuing with 64-bit storage", durations.itemsize * 8)
+    wide = array("q", durations)
+    wide[index] = elapsed
+    return wide
+
+
+def _compile_loops() -> Tuple[Callable, Callable, Callable, Callable, Callable]:
+    """Compile the warmup and timed loops from _LOOP_TEMPLATE.
+    
+    Returns:
+        Tuple of (warmup_loop, timed_loop, batched_loop, interleaved_loop,
+        flushed_loop). warmup_loop(func, n) calls func n times;
+        timed_loop(func, n) returns an array('q') of n durations in
+        nanoseconds; batched_loop(func, n, inner) returns n durations in
+        nanoseconds, each covering inner consecutive calls;
+        interleaved_loop(funcs, n) times one call of each function in turn,
+        n rounds, and returns one array per function; flushed_loop(func, n,
+        flush) is timed_loop with an untimed flush() before every call.
+        Every timed loop also accepts a typecode keyword choosing the
+        array type that durations are stored in (default 'q').
+    """
+    # itertools.repeat yields the same None object each step, so the
+    # batch loop doesn't create an int object per call the way range does
+    namespace = {"_timer": time.perf_counter_ns, "_repeat": itertools.repeat,
+                 "_array": array, "_widen": _widen}
+    code = compile(_LOOP_TEMPLATE, "<benchrun-loops>", "exec")
+    exec(code, namespace)
+    return (namespace["_warmup_loop"], namespace["_timed_loop"],
+            namespace["_batched_loop"], namespace["_interleaved_loop"],
+            namespace["_flushed_loop"])
+
+
+_warmup_loop, _timed_loop, _batched_loop, _interleaved_loop, _flushed_loop = _compile_loops()
+
+# Assumed last-level cache size when the platform doesn't report one
+_DEFAULT_LLC_SIZE = 32 * 1024 * 1024
+
+# Bytes per cache line; flushing writes one byte in each
+_CACHE_LINE_SIZE = 64
+
+# Above this many runs, raw durations are stored in 4-byte unsigned ints
+_COMPACT_RUNS = 100_000
+_COMPACT_TYPECODE = "I" if array("I").itemsize == 4 else "q"
+
+# With auto_batch, calls faster than this (in ns) are timed in batches
+# lasting at least _AUTO_BATCH_SAMPLE_TIME seconds. Up to
+# _AUTO_BATCH_PROBES single calls are timed to decide, stopping early
+# once one is fast enough or the probes after the first (which may be
+# cold) have taken _AUTO_BATCH_PROBE_BUDGET ns
+_AUTO_BATCH_THRESHOLD = 1_000
+_AUTO_BATCH_SAMPLE_TIME = 1e-5
+_AUTO_BATCH_PROBES = 5
+_AUTO_BATCH_PROBE_BUDGET = 1_000_000
+
+
+def _last_level_cache_size() -> int:
+    """Size of the CPU's last-level (L3) cache in bytes, or a 32 MiB guess."""
+    try:
+        size = os.sysconf("SC_LEVEL3_CACHE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        size = 0
+    return size if size > 0 else _DEFAULT_LLC_SIZE
+
+
+def _make_cache_flusher(size: Optional[int] = None) -> Callable[[], None]:
+    """Create a function that evicts the CPU caches by writing a large buffer.
+    
+    The returned function writes one byte into every cache line of a
+    buffer twice the size of the last-level cache, so data touched by the
+    previous sample is no longer cached. The writes run in C as a single
+    extended-slice assignment.
+    
+    Args:
+        size: Buffer size in bytes (default: twice the last-level cache)
+    
+    Returns:
+        A zero-argument function performing the flush
+    """
+    if size is None:
+        size = 2 * _last_level_cache_size()
+    buffer = bytearray(size)
+    lines = bytes(len(range(0, size, _CACHE_LINE_SIZE)))
+    
+    def flush() -> None:
+        buffer[::_CACHE_LINE_SIZE] = lines
+    
+    return flush
+
+
+@contextmanager
+def _quiet_interpreter() -> Iterator[None]:
+    """Suppress interpreter activity that adds jitter to timings.
+    
+    Disables the garbage collector, as timeit does, and raises the thread
+    switch interval so the eval loop doesn't periodically offer the GIL to
+    other threads. Both are process-wide: other Python threads may be
+    starved while this is active, so it must not be used while several
+    threads are timing at once. The previous settings are restored on exit.
+    """
+    old_interval = sys.getswitchinterval()
+    gc_was_enabled = gc.isenabled()
+    sys.setswitchinterval(_QUIET_SWITCH_INTERVAL)
+    gc.disable()
+    try:
+        yield
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+        sys.setswitchinterval(old_interval)
+
+
+def _run_timed_loop(loop: Callable, func: Callable, runs: int, *args) -> Sequence[int]:
+    """Run a compiled timed loop, logging progress when debug logging is on.
+    
+    The logging check happens once, up front. With debug logging enabled
+    the runs are split into ten chunks and progress is logged between
+    them, so the timed loop itself never contains logging code.
+    
+    Above _COMPACT_RUNS runs, durations are stored as 32-bit unsigned
+    nanoseconds, halving the buffer that the loop writes and the stats
+    pass reads. If a sample doesn't fit (over ~4.29s), the loop widens
+    the buffer to 64 bits at that point and continues; no run is repeated.
+    
+    Args:
+        loop: A timed loop from _compile_loops()
+        func: The function to benchmark
+        runs: Number of timed executions
+        *args: Extra arguments for the loop (e.g. batch size)
+    
+    Returns:
+        Integer array of durations in nanoseconds
+    """
+    typecode = _COMPACT_TYPECODE if runs > _COMPACT_RUNS else "q"
+    return _run_chunks(loop, func, runs, args, typecode)
+
+
+def _run_chunks(loop: Callable, func: Callable, runs: int, args: tuple,
+                typecode: str) -> Sequence[int]:
+    """Run a timed loop in one go, or in ten logged chunks when debugging."""
+    if runs < 100 or not logger.isEnabledFor(logging.DEBUG):
+        return loop(func, runs, *args, typecode=typecode)
+    
+    interval = runs // 10
+    durations = array(typecode)
+    while len(durations) < runs:
+        chunk = loop(func, min(interval, runs - len(durations)), *args,
+                     typecode=typecode)
+        if chunk.typecode != durations.typecode:
+            # A chunk was widened; keep the rest of the runs in 64 bits too
+            durations = array(chunk.typecode, durations)
+            typecode = chunk.typecode
+        durations += chunk
+        logger.debug("Completed %d/%d runs", len(durations), runs)
+    return durations
+
+
+def _noop() -> None:
+    """Empty function timed to measure the cost of the timed loop itself."""
+
+
+def _estimate_overhead(samples: int = 1000) -> int:
+    """Estimate the fixed cost included in every timed sample.
+    
+    Times an empty function with the single-call timed loop, so the
+    result covers both timer reads and the call itself: the part of each
+    sample that is measurement rather than the code being measured.
+    
+    Args:
+        samples: Number of empty calls to time (default: 1000)
+    
+    Returns:
+        Median per-sample overhead in nanoseconds
+    """
+    durations = sorted(_timed_loop(_noop, samples))
+    return durations[samples // 2]
+
+
+def _convert_durations(durations: Sequence[int], inner: int = 1) -> Tuple[Sequence[float], float, float]:
+    """Convert raw nanosecond durations to seconds, with mean and variance.
+    
+    The mean and sample variance are derived from exact integer sums of
+    the raw nanosecond values rather than from further passes over the
+    converted floats, so they carry no floating point cancellation error.
+    
+    Args:
+        durations: Sequence of durations in nanoseconds
+        inner: Number of calls each duration covers (default: 1)
+    
+    Returns:
+        Tuple of (array('d') of durations in seconds per call, mean,
+        sample variance)
+    
+    Raises:
+        ValueError: If durations is empty
+    """
+    n = len(durations)
+    if n == 0:
+        raise ValueError("durations list cannot be empty")
+    scale = inner * 1e9
+    total = sum(durations)
+    mean = total / n / scale
+    if n > 1:
+        squares = sum(d * d for d in durations)
+        variance = (n * squares - total * total) / (n * (n - 1)) / (scale * scale)
+    else:
+        variance = 0.0
+    return array("d", [d / scale for d in durations]), mean, variance
+
+
+def _calibrate(func: Callable, target_sample_time: float) -> int:
+    """Find how many calls make one sample last at least target_sample_time.
+    
+    A single call is timed first. If it is shorter than the target, the
+    batch size starts from the largest power of two that the probe says
+    will still fall short, and is doubled until a batch takes at least
+    target_sample_time seconds. A probe that reads as zero (a call
+    shorter than the timer's resolution) says nothing about how far to
+    jump, so doubling then starts from a single call.
+    
+    Args:
+        func: The function to benchmark
+        target_sample_time: Minimum duration of one sample in seconds
+    
+    Returns:
+        Number of calls per sample
+    """
+    target_ns = target_sample_time * 1e9
+    probe = _timed_loop(func, 1)[0]
+    if probe >= target_ns:
+        return 1
+    
+    # Skip the doublings the probe already rules out
+    inner = 1 << max(0, int(target_ns / probe).bit_length() - 1) if probe > 0 else 1
+    while _batched_loop(func, 1, inner)[0] < target_ns:
+        inner *= 2
+    return inner
+
+
+def _auto_batch_size(func: Callable) -> int:
+    """Pick a batch size for func if it is too fast to time call by call.
+    
+    The decision uses the fastest of up to _AUTO_BATCH_PROBES timed
+    calls, so one cold or preempted call can't rule batching out. Probing
+    stops as soon as a call is under _AUTO_BATCH_THRESHOLD, or once the
+    calls after the first have used up _AUTO_BATCH_PROBE_BUDGET, so a
+    slow function costs at most two extra calls. Fast functions get a
+    batch calibrated to last at least _AUTO_BATCH_SAMPLE_TIME, which keeps
+    the timer's resolution and overhead a small fraction of each sample.
+    
+    Returns:
+        Number of calls per sample (1 if func is not fast enough to batch)
+    """
+    fastest = _timed_loop(func, 1)[0]
+    spent = 0
+    for _ in range(_AUTO_BATCH_PROBES - 1):
+        if fastest < _AUTO_BATCH_THRESHOLD or spent >= _AUTO_BATCH_PROBE_BUDGET:
+            break
+        probe = _timed_loop(func, 1)[0]
+        spent += probe
+        fastest = min(fastest, probe)
+    
+    if fastest >= _AUTO_BATCH_THRESHOLD:
+        return 1
+    return _calibrate(func, _AUTO_BATCH_SAMPLE_TIME)
+
+
+def _measure(func: Callable, runs: int, warmup: int, auto_calibrate: bool = False,
+             target_sample_time: float = 0.1, quiet: bool = True,
+             ops_per_call: int = 1,
+             auto_batch: bool = False) -> Tuple[Sequence[float], float, float, int]:
+    """Warm up, optionally calibrate, and time a function.
+    
+    Args:
+        func: The function to benchmark
+        runs: Number of timed executions
+        warmup: Number of untimed warmup executions
+        auto_calibrate: Time batches of calls sized by calibration
+        target_sample_time: Minimum duration of one batch in seconds
+        quiet: Run the timed loop under _quiet_interpreter(). Must be False
+               when other threads are timing concurrently
+        ops_per_call: Number of operations one call of func performs;
+                      durations are divided by it (default: 1)
+        auto_batch: Time batches of calls if a single call is under a
+                    microsecond, and warm up with as many batches as
+                    warmup; ignored when auto_calibrate is True
+    
+    Returns:
+        Tuple of (array('d') of per-operation durations in seconds, mean,
+        sample variance, operations per sample), as in _convert_durations
+    """
+    _warmup_loop(func, warmup)
+    
+    if auto_calibrate:
+        inner = _calibrate(func, target_sample_time)
+    elif auto_batch:
+        inner = _auto_batch_size(func)
+        # Count automatic batches like the runs they replace: top the
+        # warmup up to the same number of batches, so a sub-microsecond
+        # function still gets enough calls to reach a steady state
+        _warmup_loop(func, warmup * (inner - 1))
+    else:
+        inner = 1
+    with _quiet_interpreter() if quiet else nullcontext():
+        if inner == 1:
+            raw = _run_timed_loop(_timed_loop, func, runs)
+        else:
+            raw = _run_timed_loop(_batched_loop, func, runs, inner)
+    inner *= ops_per_call
+    return (*_convert_durations(raw, inner), inner)
+
+
+def _as_count(value: int, minimum: int, message: str) -> int:
+    """Convert an integer-like count to int, raising ValueError(message) if invalid.
+    
+    Anything with __index__ (numpy integers, IntEnum members) is accepted;
+    bools are rejected even though they are ints.
+    """
+    if isinstance(value, bool):
+        raise ValueError(message)
+    try:
+        value = operator.index(value)
+    except TypeError:
+        raise ValueError(message) from None
+    if value < minimum:
+        raise ValueError(message)
+    return value
+
+
+def _check_arguments(func: Callable, runs: int, warmup: int) -> Tuple[int, int]:
+    """Validate benchmark() arguments that failed the fast check.
+    
+    Returns:
+        Tuple of (runs, warmup) converted to plain ints
+    
+    Raises:
+        TypeError: If func is not callable
+        ValueError: If runs or warmup is not a valid count
+    """
+    if not callable(func):
+        raise TypeError("func must be callable")
+    runs = _as_count(runs, 1, "runs must be a positive integer")
+    warmup = _as_count(warmup, 0, "warmup must be a non-negative integer")
+    return runs, warmup
+
+
+def benchmark(func: Callable, runs: int = 100, warmup: int = 0,
+              auto_calibrate: bool = False,
+              target_sample_time: float = 0.1,
+              auto_batch: bool = False) -> Sequence[float]:
     """Benchmark a function with high-resolution timing.
     
+    By default every run times a single call. With auto_batch=True, a
+    function whose calls take under a microsecond, where the timer's
+    resolution and overhead would be a large part of each sample, is
+    instead timed in batches of consecutive calls lasting about 10μs;
+    deciding this takes up to five extra untimed calls (at most two for
+    slow functions), so func is called more often than warmup + runs. With auto_calibrate=True every function is
+    batched, sized so one batch takes at least target_sample_time. Either
+    way the reported duration is the batch time divided by the batch
+    size, and the calls used to size the batch happen after warmup and
+    are not timed. Automatic batches also apply to warmup: it is topped
+    up to warmup batches once the batch size is known.
+    
+    While the timed runs execute, the garbage collector is disabled and
+    the thread switch interval is raised, so neither GC pauses nor GIL
+    hand-offs add jitter. The cost is that other Python threads get no
+    time during the runs; both settings are restored afterwards.
+    
     Args:
         func: The function to benchmark
         runs: Number of timed executions (default: 100)
         warmup: Number of untimed warmup executions (default: 0)
+        auto_calibrate: Time batches of calls sized by calibration (default: False)
+        target_sample_time: Minimum duration of one batch in seconds when
+                            auto_calibrate is True (default: 0.1)
+        auto_batch: Batch sub-microsecond calls (default: False)
     
     Returns:
-        List of execution times in seconds for each run
+        array.array('d') of execution times in seconds for each run (per
+        call when calls were batched). It supports len(), indexing and
+        iteration like a list; call .tolist() if a list is needed.
+    
+    Raises:
+        TypeError: If func is not callable
+        ValueError: If runs is not a positive integer or warmup is not a
+                    non-negative integer
     
     Example:
         >>> def my_func():
@@ -21,16 +479,13 @@ def benchmark(func: Callable, runs: int = 100, warmup: int = 0) -> List[float]:
         >>> durations = benchmark(my_func, runs=10, warmup=5)
         >>> print(f"Mean: {sum(durations)/len(durations):.6f}s")
     """
-    # Warmup runs
-    for _ in range(warmup):
-        func()
-    
-    # Timed runs
-    durations = []
-    for _ in range(runs):
-        start = time.perf_counter()
-        func()
-        end = time.perf_counter()
-        durations.append(end - start)
+    # One combined check for the common case of plain ints; anything else
+    # (integer-likes such as numpy integers, or invalid values) goes
+    # through the detailed checks, which also pick the error to raise
+    if not (callable(func) and type(runs) is int and runs > 0
+            and type(warmup) is int and warmup >= 0):
+        runs, warmup = _check_arguments(func, runs, warmup)
     
-    return durations
\ No newline at end of file
+    durations, _, _, _ = _measure(func, runs, warmup, auto_calibrate, target_sample_time,
+                                  auto_batch=auto_batch)
+    return durations
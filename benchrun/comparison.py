@@ -1,10 +1,41 @@
 """Utilities for comparing benchmark results."""
 
-from typing import Dict
-from benchrun.results import BenchmarkResults
+from operator import attrgetter
+from typing import Dict, List, Optional, Sequence, Tuple
+from benchrun.results import BenchmarkResults, ResultsDict
 
 
-def calculate_comparisons(results: Dict[str, BenchmarkResults]) -> None:
+# Short metric names accepted by the public API and the attribute they map to
+_METRIC_ATTRIBUTES = {"min": "min_time", "max": "max_time"}
+
+
+def _normalize_metric(metric: str) -> str:
+    """Map a metric name like 'min' to its BenchmarkResults attribute."""
+    return _METRIC_ATTRIBUTES.get(metric, metric)
+
+
+def _sorted_items(results: Dict[str, BenchmarkResults],
+                  sort_by: str = "mean") -> List[Tuple[str, BenchmarkResults]]:
+    """Return (name, result) pairs sorted ascending by a metric.
+    
+    Args:
+        results: Dictionary mapping implementation names to BenchmarkResults
+        sort_by: Metric to sort by ('mean', 'median', 'min', 'max', or any
+                 BenchmarkResults attribute). Default: 'mean'
+    
+    Returns:
+        List of (name, result) tuples
+    """
+    attribute = _normalize_metric(sort_by)
+    if isinstance(results, ResultsDict):
+        return [(name, results[name]) for name in results.sorted_names(attribute)]
+    key = attrgetter(attribute)
+    return sorted(results.items(), key=lambda item: key(item[1]))
+
+
+def calculate_comparisons(results: Dict[str, BenchmarkResults],
+                          means: Optional[Sequence[float]] = None,
+                          names: Optional[Sequence[str]] = None) -> None:
     """Calculate comparison metrics for all results.
     
     This function modifies the results in-place, adding speedup and
@@ -12,6 +43,11 @@ def calculate_comparisons(results: Dict[str, BenchmarkResults]) -> None:
     
     Args:
         results: Dictionary mapping implementation names to BenchmarkResults
+        means: Optional precomputed mean times, parallel to ``names``
+        names: Optional implementation names, parallel to ``means``
+    
+    If results is a ResultsDict, the fastest name is also recorded on it
+    so get_fastest() can return it without another scan.
     
     The fastest implementation gets:
         - speedup = 1.0
@@ -24,26 +60,41 @@ def calculate_comparisons(results: Dict[str, BenchmarkResults]) -> None:
     if not results:
         return
     
-    # Find the fastest implementation based on mean time
-    fastest_name = min(results.keys(), key=lambda k: results[k].mean)
-    fastest_time = results[fastest_name].mean
+    if means is None or names is None:
+        names = list(results)
+        means = [result.mean for result in results.values()]
+    
+    # The fastest implementation is the one with the lowest mean time;
+    # one scan finds both its position (hence its name) and its time
+    fastest_index = min(range(len(means)), key=means.__getitem__)
+    fastest_time = means[fastest_index]
+    if isinstance(results, ResultsDict):
+        results.fastest_name = names[fastest_index]
     
     # Calculate relative metrics for all implementations
-    for name, result in results.items():
-        if result.mean > 0:
-            result.speedup = fastest_time / result.mean
-            result.relative_performance = (fastest_time / result.mean) * 100
+    for name, mean in zip(names, means):
+        result = results[name]
+        if mean > 0:
+            speedup = fastest_time / mean
+            result.speedup = speedup
+            result.relative_performance = speedup * 100
         else:
             result.speedup = 1.0
             result.relative_performance = 100.0
 
 
-def get_fastest(results: Dict[str, BenchmarkResults], metric: str = "mean") -> str:
+def get_fastest(results: Dict[str, BenchmarkResults], metric: str = "mean",
+                break_ties: bool = False) -> str:
     """Get the name of the fastest implementation.
     
     Args:
         results: Dictionary mapping implementation names to BenchmarkResults
         metric: Metric to compare ('mean', 'median', 'min'). Default: 'mean'
+        break_ties: For metric='mean', treat implementations whose means
+                    differ by no more than 2×MAD (the larger of the two) as
+                    tied and pick the one with the smallest MAD. The answer
+                    may then differ from the lowest mean that speedups and
+                    print_comparison use. Default: False
     
     Returns:
         Name of the fastest implementation
@@ -58,11 +109,33 @@ def get_fastest(results: Dict[str, BenchmarkResults], metric: str = "mean") -> s
     if metric not in valid_metrics:
         raise ValueError(f"Invalid metric '{metric}'. Must be one of {valid_metrics}")
     
-    # Normalize metric name
-    if metric == "min":
-        metric = "min_time"
+    # Reuse the ranking calculate_comparisons() already did
+    if metric == "mean" and isinstance(results, ResultsDict) and results.fastest_name:
+        fastest = results.fastest_name
+    else:
+        metric = _normalize_metric(metric)
+        names = list(results)
+        values = [getattr(result, metric) for result in results.values()]
+        fastest = names[values.index(min(values))]
+    
+    if break_ties and metric == "mean":
+        return _break_mean_tie(results, fastest)
+    return fastest
+
+
+def _break_mean_tie(results: Dict[str, BenchmarkResults], fastest: str) -> str:
+    """Pick the lowest-MAD result among those tied with the fastest mean.
     
-    return min(results.keys(), key=lambda k: getattr(results[k], metric))
+    A result is tied when its mean is within 2×MAD of the fastest mean,
+    using whichever of the two MADs is larger, so a noisy runner-up is
+    not ruled out just because the leader happens to be steady.
+    """
+    best = results[fastest]
+    tied = [name for name, result in results.items()
+            if result.mean - best.mean <= 2 * max(best.mad, result.mad)]
+    if len(tied) == 1:
+        return fastest
+    return min(tied, key=lambda name: (results[name].mad, results[name].mean))
 
 
 def get_slowest(results: Dict[str, BenchmarkResults], metric: str = "mean") -> str:
@@ -85,11 +158,10 @@ def get_slowest(results: Dict[str, BenchmarkResults], metric: str = "mean") -> s
     if metric not in valid_metrics:
         raise ValueError(f"Invalid metric '{metric}'. Must be one of {valid_metrics}")
     
-    # Normalize metric name
-    if metric == "max":
-        metric = "max_time"
-    
-    return max(results.keys(), key=lambda k: getattr(results[k], metric))
+    metric = _normalize_metric(metric)
+    names = list(results)
+    values = [getattr(result, metric) for result in results.values()]
+    return names[values.index(max(values))]
 
 
 def calculate_speedup(baseline: BenchmarkResults, comparison: BenchmarkResults, 
@@ -106,11 +178,7 @@ def calculate_speedup(baseline: BenchmarkResults, comparison: BenchmarkResults,
         Values > 1.0 mean comparison is faster
         Values < 1.0 mean comparison is slower
     """
-    if metric == "min":
-        metric = "min_time"
-    elif metric == "max":
-        metric = "max_time"
-    
+    metric = _normalize_metric(metric)
     baseline_time = getattr(baseline, metric)
     comparison_time = getattr(comparison, metric)
     
@@ -1,102 +1,119 @@
 """Display and formatting utilities for benchmark results."""
 
-from typing import Dict, List, Tuple
+import io
+import sys
+from typing import Dict, List, Optional, TextIO
 from benchrun.results import BenchmarkResults
+from benchrun.comparison import _normalize_metric, _sorted_items
+
+
+_EMPTY_MSG = "No results to display."
+_EMPTY_LINE = _EMPTY_MSG + "\n"
 
 
 def print_comparison(results: Dict[str, BenchmarkResults], 
                     sort_by: str = "mean",
-                    show_all_stats: bool = True) -> None:
+                    show_all_stats: bool = True,
+                    file: Optional[TextIO] = None) -> None:
     """Print a formatted comparison table of benchmark results.
     
+    The whole table is assembled in memory and written with a single
+    call, so it is never interleaved with other output.
+    
     Args:
         results: Dictionary mapping implementation names to BenchmarkResults
         sort_by: Metric to sort by ('mean', 'median', 'min', 'max'). Default: 'mean'
         show_all_stats: Whether to show all statistics. Default: True
+        file: Stream to write to. Default: sys.stdout
     
     Example output:
         Benchmark Comparison
         ==========================================
         
-        Implementation      Mean        Median      Std Dev     Min         Max         Speedup
-        ─────────────────────────────────────────────────────────────────────────────────────────
-        optimized          1.234ms     1.230ms     0.045ms     1.180ms     1.350ms     1.00x ★
-        baseline           2.456ms     2.450ms     0.089ms     2.340ms     2.680ms     0.50x
-        slow_version       4.890ms     4.870ms     0.156ms     4.650ms     5.230ms     0.25x
+        Implementation      Mean        Median      Std Dev     MAD         Min         Max         Speedup
+        ─────────────────────────────────────────────────────────────────────────────────────────────────────
+        optimized          1.234ms     1.230ms     0.045ms     0.021ms     1.180ms     1.350ms     1.00x ★
+        baseline           2.456ms     2.450ms     0.089ms     0.040ms     2.340ms     2.680ms     0.50x
+        slow_version       4.890ms     4.870ms     0.156ms     0.071ms     4.650ms     5.230ms     0.25x
     """
+    if file is None:
+        file = sys.stdout
+    
     if not results:
-        print("No results to display.")
+        file.write(_EMPTY_LINE)
         return
     
-    # Normalize sort_by
-    if sort_by == "min":
-        sort_by = "min_time"
-    elif sort_by == "max":
-        sort_by = "max_time"
+    buf = io.StringIO()
+    w = buf.write
     
-    # Sort results
-    sorted_names = sorted(results.keys(), key=lambda k: getattr(results[k], sort_by))
+    sorted_items = _sorted_items(results, sort_by)
     
     # Find the fastest for marking
-    fastest_name = sorted_names[0]
+    fastest_name, fastest_result = sorted_items[0]
     
-    # Print header
-    print("\nBenchmark Comparison")
-    print("=" * 100)
-    print()
+    # Header
+    w("\nBenchmark Comparison\n")
+    w("=" * 100 + "\n")
+    w("\n")
     
     # Determine column widths
     max_name_len = max(len(name) for name in results.keys())
     name_width = max(max_name_len, len("Implementation"))
     
-    # Print table header
+    # Row template, parsed once and filled per row with format_map. The
+    # compact layout simply leaves the extra cells unused.
     if show_all_stats:
-        header = f"{'Implementation':<{name_width}}  {'Mean':>12}  {'Median':>12}  {'Std Dev':>12}  {'Min':>12}  {'Max':>12}  {'Speedup':>10}"
+        row_template = (f"{{name:<{name_width}}}  {{mean:>12}}  {{median:>12}}  {{std:>12}}  "
+                        f"{{mad:>12}}  {{min:>12}}  {{max:>12}}  {{speedup:>10}}\n")
     else:
-        header = f"{'Implementation':<{name_width}}  {'Mean':>12}  {'Std Dev':>12}  {'Speedup':>10}"
-    
-    print(header)
-    print("─" * len(header))
-    
-    # Print results
-    for name in sorted_names:
-        result = results[name]
-        is_fastest = (name == fastest_name)
-        
-        # Format times
-        mean_str = result.format_time(result.mean)
-        median_str = result.format_time(result.median)
-        std_str = result.format_time(result.std_dev)
-        min_str = result.format_time(result.min_time)
-        max_str = result.format_time(result.max_time)
-        
+        row_template = f"{{name:<{name_width}}}  {{mean:>12}}  {{std:>12}}  {{speedup:>10}}\n"
+    
+    header = row_template.format(name="Implementation", mean="Mean", median="Median",
+                                 std="Std Dev", mad="MAD", min="Min", max="Max",
+                                 speedup="Speedup")
+    w(header)
+    w("─" * (len(header) - 1) + "\n")
+    
+    # Results. The fastest is the first row, so the marker is attached
+    # once and then cleared instead of comparing names on every row.
+    marker = " ★"
+    for name, result in sorted_items:
         # Format speedup
         speedup_str = f"{result.speedup:.2f}x" if result.speedup else "N/A"
-        if is_fastest:
-            speedup_str += " ★"
+        speedup_str += marker
+        marker = ""
         
-        # Print row
-        if show_all_stats:
-            print(f"{name:<{name_width}}  {mean_str:>12}  {median_str:>12}  {std_str:>12}  {min_str:>12}  {max_str:>12}  {speedup_str:>10}")
-        else:
-            print(f"{name:<{name_width}}  {mean_str:>12}  {std_str:>12}  {speedup_str:>10}")
-    
-    print()
-    
-    # Print summary
-    fastest_result = results[fastest_name]
-    slowest_name = sorted_names[-1]
-    slowest_result = results[slowest_name]
-    
-    print("Summary:")
-    print(f"  Fastest: {fastest_name} ({fastest_result.format_time(fastest_result.mean)})")
-    print(f"  Slowest: {slowest_name} ({slowest_result.format_time(slowest_result.mean)})")
+        w(row_template.format_map({
+            "name": name,
+            "mean": result.format_time(result.mean),
+            "median": result.format_time(result.median),
+            "std": result.format_time(result.std_dev),
+            "mad": result.format_time(result.mad),
+            "min": result.format_time(result.min_time),
+            "max": result.format_time(result.max_time),
+            "speedup": speedup_str,
+        }))
+    
+    w("\n")
+    
+    # Summary
+    slowest_name, slowest_result = sorted_items[-1]
+    
+    w("Summary:\n")
+    w(f"  Fastest: {fastest_name} ({fastest_result.format_time(fastest_result.mean)})\n")
+    w(f"  Slowest: {slowest_name} ({slowest_result.format_time(slowest_result.mean)})\n")
     
     if len(results) > 1:
-        ratio = slowest_result.mean / fastest_result.mean
-        print(f"  Difference: {ratio:.2f}x")
+        # Speedups are fastest_mean / mean, so their ratio is the mean ratio
+        if fastest_result.speedup and slowest_result.speedup:
+            ratio = fastest_result.speedup / slowest_result.speedup
+        else:
+            ratio = slowest_result.mean / fastest_result.mean
+        w(f"  Difference: {ratio:.2f}x\n")
     
-    print()
+    w("\n")
+    
+    file.write(buf.getvalue())
 
 
 def format_results_table(results: Dict[str, BenchmarkResults], 
@@ -116,26 +133,15 @@ def format_results_table(results: Dict[str, BenchmarkResults],
         >>> for line in lines:
         ...     print(line)
     """
-    lines = []
-    
     if not results:
-        return ["No results to display."]
-    
-    # Normalize sort_by
-    if sort_by == "min":
-        sort_by = "min_time"
-    elif sort_by == "max":
-        sort_by = "max_time"
+        # A new list each call, since callers are free to modify it
+        return [_EMPTY_MSG]
     
-    # Sort results
-    sorted_names = sorted(results.keys(), key=lambda k: getattr(results[k], sort_by))
-    
-    lines.append("")
+    lines = [""]
     lines.append("Benchmark Results")
     lines.append("=" * 50)
     
-    for name in sorted_names:
-        result = results[name]
+    for name, result in _sorted_items(results, sort_by):
         lines.append("")
         lines.append(f"{name}:")
         lines.append(f"  Mean:   {result.format_time(result.mean)}")
@@ -170,21 +176,17 @@ def create_bar_chart(results: Dict[str, BenchmarkResults],
         Bar Chart (mean)
         ================================================
         
-        fast    ████████████  1.234ms
-        slow    ████████████████████████  2.456ms
+        fast  ████████████              1.234ms
+        slow  ████████████████████████  2.456ms
     """
     if not results:
-        return "No results to display."
+        return _EMPTY_MSG
     
-    # Normalize metric
-    if metric == "min":
-        metric = "min_time"
-    elif metric == "max":
-        metric = "max_time"
+    metric = _normalize_metric(metric)
     
-    # Get values
-    values = [(name, getattr(results[name], metric)) for name in results.keys()]
-    values.sort(key=lambda x: x[1])
+    # Get values in ascending order
+    values = [(name, getattr(result, metric))
+              for name, result in _sorted_items(results, metric)]
     
     # Find max value for scaling
     max_value = max(v[1] for v in values)
@@ -201,10 +203,12 @@ def create_bar_chart(results: Dict[str, BenchmarkResults],
     max_name_len = max(len(name) for name, _ in values)
     
     for name, value in values:
-        bar_length = int((value / max_value) * width)
+        # Any non-zero value gets at least one block so it stays visible;
+        # padding the bar to the full width lines up the value column
+        bar_length = max(1, int((value / max_value) * width)) if value > 0 else 0
         bar = "█" * bar_length
         formatted_value = results[name].format_time(value)
-        lines.append(f"{name:<{max_name_len}}  {bar}  {formatted_value}")
+        lines.append(f"{name:<{max_name_len}}  {bar:<{width}}  {formatted_value}")
     
     lines.append("")
     
@@ -1,8 +1,128 @@
 """Data structures for storing benchmark results."""
 
-import statistics
-from typing import List, Optional
-from dataclasses import dataclass, field
+import math
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Sequence
+from dataclasses import InitVar, dataclass, field
+
+
+# (threshold, multiplier, unit, format spec) for each power of 1000 below
+# one second, largest first; anything under the last threshold is in ns
+_TIME_UNITS = (
+    (1.0, 1.0, "s", ".6f"),
+    (1e-3, 1e3, "ms", ".3f"),
+    (1e-6, 1e6, "μs", ".3f"),
+)
+
+
+@lru_cache(maxsize=1024)
+def _format_time(time_value: float) -> str:
+    """Format a time in seconds with the largest unit it reaches.
+    
+    Cached because displays format the same statistics repeatedly, e.g.
+    the fastest mean in both its table row and the summary.
+    """
+    # At most three comparisons; cheaper than deriving the unit from
+    # math.log10, and zero, negative and NaN values fall through to ns
+    for threshold, multiplier, unit, spec in _TIME_UNITS:
+        if time_value >= threshold:
+            return f"{time_value * multiplier:{spec}}{unit}"
+    return f"{time_value * 1e9:.3f}ns"
+
+
+class DurationStats(NamedTuple):
+    """Summary statistics computed from a list of durations.
+    
+    Produced by compute_stats() and passed to BenchmarkResults so that
+    statistics computed once (e.g. by the runner, or stored alongside
+    cached timings) are not recomputed per result object.
+    """
+    
+    mean: float
+    median: float
+    std_dev: float
+    mad: float
+    min_time: float
+    max_time: float
+    percentile_95: float
+    percentile_99: float
+
+
+def _percentile(sorted_data: List[float], percentile: float) -> float:
+    """Calculate percentile from sorted data.
+    
+    Args:
+        sorted_data: Sorted list of values
+        percentile: Percentile to calculate (0-100)
+    
+    Returns:
+        The value at the given percentile
+    """
+    if not sorted_data:
+        return 0.0
+    
+    k = (len(sorted_data) - 1) * (percentile / 100)
+    f = int(k)
+    c = f + 1
+    
+    if c >= len(sorted_data):
+        return sorted_data[-1]
+    
+    d0 = sorted_data[f]
+    d1 = sorted_data[c]
+    return d0 + (d1 - d0) * (k - f)
+
+
+def _median_of_sorted(sorted_data: List[float]) -> float:
+    """Get the median of already sorted, non-empty data."""
+    mid = len(sorted_data) // 2
+    if len(sorted_data) % 2:
+        return sorted_data[mid]
+    return (sorted_data[mid - 1] + sorted_data[mid]) / 2
+
+
+def compute_stats(durations: Sequence[float], mean: Optional[float] = None,
+                  variance: Optional[float] = None) -> DurationStats:
+    """Compute summary statistics for a list of durations.
+    
+    Args:
+        durations: Non-empty sequence of execution times in seconds
+        mean: Mean of durations, if already known
+        variance: Sample variance of durations, if already known
+    
+    Returns:
+        DurationStats for the durations
+    """
+    n = len(durations)
+    if mean is None:
+        mean = math.fsum(durations) / n
+    if variance is None:
+        if n > 1:
+            variance = math.fsum((d - mean) ** 2 for d in durations) / (n - 1)
+        else:
+            variance = 0.0
+    std_dev = math.sqrt(variance)
+    
+    # Every order statistic (min, max, median, percentiles) reads from a
+    # single sort, dropped once they are taken. A heap selection would
+    # not save anything here since the median needs the sort anyway.
+    sorted_durations = sorted(durations)
+    median = _median_of_sorted(sorted_durations)
+    
+    # Median absolute deviation: a spread estimate that, unlike std_dev,
+    # is not inflated by a few outliers such as GC pauses
+    mad = _median_of_sorted(sorted([abs(d - median) for d in durations]))
+    
+    return DurationStats(
+        mean=mean,
+        median=median,
+        std_dev=std_dev,
+        mad=mad,
+        min_time=sorted_durations[0],
+        max_time=sorted_durations[-1],
+        percentile_95=_percentile(sorted_durations, 95),
+        percentile_99=_percentile(sorted_durations, 99),
+    )
 
 
 @dataclass
@@ -11,74 +131,78 @@ class BenchmarkResults:
     
     Attributes:
         name: Name of the implementation
-        durations: List of execution times in seconds
+        durations: Execution times in seconds; a list or, as produced by
+                   the runner, an array('d')
         runs: Number of timed runs
         warmup: Number of warmup runs
+        batch_size: Number of operations each timed sample covered (calls
+                    batched by auto_calibrate, times the operations per call
+                    of a batched implementation); durations are per
+                    operation (sample time / batch_size)
+        timing_overhead: Estimated per-call measurement overhead in seconds
+                         (timer reads and call dispatch), 0.0 if unknown
         mean: Mean execution time
         median: Median execution time
         std_dev: Standard deviation of execution times
+        mad: Median absolute deviation of execution times (a robust spread
+             estimate, recommended together with the median by perf)
         min_time: Minimum execution time
         max_time: Maximum execution time
         percentile_95: 95th percentile execution time
         percentile_99: 99th percentile execution time
         speedup: Speedup relative to baseline (set by comparison)
         relative_performance: Performance relative to fastest (set by comparison)
+    
+    Pass ``stats`` (from compute_stats) to reuse statistics that were
+    already computed for the same durations.
     """
     
     name: str
-    durations: List[float]
+    durations: Sequence[float]
     runs: int
     warmup: int
+    batch_size: int = 1
+    timing_overhead: float = 0.0
     mean: float = field(init=False)
     median: float = field(init=False)
     std_dev: float = field(init=False)
+    mad: float = field(init=False)
     min_time: float = field(init=False)
     max_time: float = field(init=False)
     percentile_95: float = field(init=False)
     percentile_99: float = field(init=False)
     speedup: Optional[float] = field(default=None, init=False)
     relative_performance: Optional[float] = field(default=None, init=False)
+    stats: InitVar[Optional[DurationStats]] = None
     
-    def __post_init__(self):
+    def __post_init__(self, stats: Optional[DurationStats]):
         """Calculate statistics after initialization."""
         if not self.durations:
             raise ValueError("durations list cannot be empty")
         
-        self.mean = statistics.mean(self.durations)
-        self.median = statistics.median(self.durations)
-        self.std_dev = statistics.stdev(self.durations) if len(self.durations) > 1 else 0.0
-        self.min_time = min(self.durations)
-        self.max_time = max(self.durations)
-        
-        # Calculate percentiles
-        sorted_durations = sorted(self.durations)
-        self.percentile_95 = self._percentile(sorted_durations, 95)
-        self.percentile_99 = self._percentile(sorted_durations, 99)
-    
-    @staticmethod
-    def _percentile(sorted_data: List[float], percentile: float) -> float:
-        """Calculate percentile from sorted data.
+        if stats is None:
+            stats = compute_stats(self.durations)
         
-        Args:
-            sorted_data: Sorted list of values
-            percentile: Percentile to calculate (0-100)
+        self.mean = stats.mean
+        self.median = stats.median
+        self.std_dev = stats.std_dev
+        self.mad = stats.mad
+        self.min_time = stats.min_time
+        self.max_time = stats.max_time
+        self.percentile_95 = stats.percentile_95
+        self.percentile_99 = stats.percentile_99
+    
+    @property
+    def overhead_pct(self) -> float:
+        """Measurement overhead as a percentage of the mean time.
         
-        Returns:
-            The value at the given percentile
+        Above roughly 10% the measurement overhead dominates and the
+        timings mostly reflect the timer; use a larger workload or
+        batched timing (auto_calibrate) instead.
         """
-        if not sorted_data:
+        if self.mean <= 0:
             return 0.0
-        
-        k = (len(sorted_data) - 1) * (percentile / 100)
-        f = int(k)
-        c = f + 1
-        
-        if c >= len(sorted_data):
-            return sorted_data[-1]
-        
-        d0 = sorted_data[f]
-        d1 = sorted_data[c]
-        return d0 + (d1 - d0) * (k - f)
+        return 100 * self.timing_overhead / self.mean
     
     def format_time(self, time_value: float) -> str:
         """Format a time value with appropriate units.
@@ -89,23 +213,23 @@ class BenchmarkResults:
         Returns:
             Formatted string with appropriate unit (s, ms, μs, ns)
         """
-        if time_value >= 1.0:
-            return f"{time_value:.6f}s"
-        elif time_value >= 1e-3:
-            return f"{time_value * 1e3:.3f}ms"
-        elif time_value >= 1e-6:
-            return f"{time_value * 1e6:.3f}μs"
-        else:
-            return f"{time_value * 1e9:.3f}ns"
+        # -0.0 == 0.0 with the same hash, so normalize it rather than let
+        # whichever was formatted first decide both cached strings
+        return _format_time(time_value + 0.0)
     
     def __str__(self) -> str:
         """String representation of results."""
+        runs = f"{self.runs}"
+        if self.batch_size > 1:
+            runs += f" x {self.batch_size} calls"
+        
         lines = [
             f"Benchmark Results: {self.name}",
-            f"  Runs: {self.runs} (warmup: {self.warmup})",
+            f"  Runs: {runs} (warmup: {self.warmup})",
             f"  Mean:   {self.format_time(self.mean)}",
             f"  Median: {self.format_time(self.median)}",
             f"  Std:    {self.format_time(self.std_dev)}",
+            f"  MAD:    {self.format_time(self.mad)}",
             f"  Min:    {self.format_time(self.min_time)}",
             f"  Max:    {self.format_time(self.max_time)}",
         ]
@@ -116,4 +240,91 @@ class BenchmarkResults:
         if self.relative_performance is not None:
             lines.append(f"  Relative: {self.relative_performance:.1f}%")
         
-        return "\n".join(lines)
\ No newline at end of file
+        return "\n".join(lines)
+
+
+class ResultsDict(dict):
+    """Dictionary of BenchmarkResults that caches its sort orders.
+    
+    Displays and comparisons often sort the same results by the same
+    metric several times in a row. ResultsDict remembers the name order
+    for each metric until the dictionary itself is modified. The cache
+    assumes the statistics of the contained results are not changed in
+    place.
+    
+    Attributes:
+        fastest_name: Name of the implementation with the lowest mean,
+                      recorded by calculate_comparisons (None until then)
+    
+    Example:
+        >>> results = runner.run()  # returns a ResultsDict
+        >>> results.sorted_names("mean")
+        ['fast', 'slow']
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._sorted_cache: Dict[str, List[str]] = {}
+        self.fastest_name: Optional[str] = None
+    
+    def sorted_names(self, attribute: str) -> List[str]:
+        """Get names ordered by ascending value of a result attribute.
+        
+        Args:
+            attribute: BenchmarkResults attribute to sort by (e.g. 'mean',
+                       'min_time')
+        
+        Returns:
+            List of implementation names. Do not modify it; it is shared
+            with the cache.
+        """
+        names = self._sorted_cache.get(attribute)
+        if names is None:
+            names = sorted(self, key=lambda name: getattr(self[name], attribute))
+            self._sorted_cache[attribute] = names
+        return names
+    
+    def __reduce__(self):
+        # Unpickling a dict subclass restores items through __setitem__
+        # before __dict__ exists, so rebuild from a plain dict instead
+        return type(self), (dict(self),), {"fastest_name": self.fastest_name}
+    
+    def _invalidate(self) -> None:
+        self._sorted_cache.clear()
+        self.fastest_name = None
+    
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._invalidate()
+    
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._invalidate()
+    
+    def __ior__(self, other):
+        # dict.__ior__ only exists from Python 3.9; update() invalidates
+        self.update(other)
+        return self
+    
+    def clear(self):
+        super().clear()
+        self._invalidate()
+    
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._invalidate()
+        return value
+    
+    def popitem(self):
+        item = super().popitem()
+        self._invalidate()
+        return item
+    
+    def setdefault(self, key, default=None):
+        value = super().setdefault(key, default)
+        self._invalidate()
+        return value
+    
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._invalidate()
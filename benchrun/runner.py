@@ -1,10 +1,29 @@
 """Benchmark runner for comparing multiple implementations."""
 
+import gc
+import logging
+import os
+import sys
 import time
-from typing import Callable, Dict, Optional, List
-from benchrun.results import BenchmarkResults
+from array import array
+from functools import partial
+from contextlib import contextmanager, nullcontext
+from typing import (Callable, Dict, Hashable, Iterator, Optional, Sequence, Set, TextIO,
+                    Tuple, Union)
+from benchrun.benchmark import (_calibrate, _compile_loops, _convert_durations,
+                                _estimate_overhead, _make_cache_flusher, _measure,
+                                _quiet_interpreter, _run_timed_loop)
+from benchrun.results import BenchmarkResults, DurationStats, ResultsDict, compute_stats
 from benchrun.comparison import calculate_comparisons
 
+logger = logging.getLogger(__name__)
+
+# Operations per call for batched implementations registered without a batch_size
+_DEFAULT_BATCH_SIZE = 1000
+
+_NO_CACHE_DROP_MSG = ("Cannot drop the page cache (requires root on Linux); "
+                      "file-backed data may stay cached between implementations")
+
 
 class BenchmarkRunner:
     """Runner for benchmarking and comparing multiple function implementations.
@@ -20,35 +39,178 @@ class BenchmarkRunner:
         >>> runner.print_comparison()
     """
     
-    def __init__(self, runs: int = 100, warmup: int = 0):
+    _PARALLEL_MODES = (False, True, "process", "thread")
+    
+    def __init__(self, runs: int = 100, warmup: int = 0,
+                 parallel: Union[bool, str] = False,
+                 max_workers: Optional[int] = None,
+                 isolate: bool = False,
+                 processes: int = 1,
+                 shared_warmup: bool = False,
+                 auto_calibrate: bool = False,
+                 target_sample_time: float = 0.1,
+                 stabilize: bool = False,
+                 interleaved: bool = False,
+                 flush_cache: bool = False):
         """Initialize the benchmark runner.
         
         Args:
             runs: Number of timed executions per implementation (default: 100)
             warmup: Number of untimed warmup executions (default: 0)
+            parallel: Time implementations concurrently. True or 'process'
+                      uses a process pool, which needs picklable module-level
+                      functions, 'thread' a thread pool. Concurrent runs
+                      compete for cores and caches, so this suits quick
+                      relative comparisons (default: False)
+            max_workers: Maximum number of pool workers (default: executor default)
+            isolate: Run each implementation in its own fresh subprocess, so
+                     none inherits another's caches or allocator state.
+                     Functions must be picklable and importable by name, so
+                     not defined in __main__ (default: False)
+            processes: Number of subprocesses per implementation when
+                       isolate is True; their durations are combined (default: 1)
+            shared_warmup: Amortize warmup across implementations run in the
+                           same process: the first gets warmup // 2 runs and
+                           each later one max(1, warmup // 4), since much of
+                           what warmup primes (imports, allocator, CPU caches)
+                           is process-wide. Implementations added with
+                           needs_warmup=True keep the full warmup (default: False)
+            auto_calibrate: Time batches of calls sized by calibration, and
+                            report per-call durations (default: False)
+            target_sample_time: Minimum duration of one batch in seconds when
+                                auto_calibrate is True (default: 0.1)
+            stabilize: Pin to one CPU for the whole run, and collect garbage
+                       and (as root on Linux) drop the page cache before each
+                       implementation (default: False)
+            interleaved: Time implementations round robin, one call each per
+                         round, instead of one after the other (default: False)
+            flush_cache: Evict the CPU caches before every timed run, to
+                         measure cold-cache performance. The flush is not
+                         timed but takes a few milliseconds per run, so it
+                         suits workloads of roughly 10ms or more (default: False)
+        
+        Raises:
+            ValueError: If parallel is not one of False, True, 'process', 'thread',
+                        if processes is less than 1, if isolate is combined
+                        with parallel, if stabilize is combined with either,
+                        or if interleaved or flush_cache is combined with
+                        parallel, isolate or auto_calibrate, or with each other
         """
+        if parallel not in self._PARALLEL_MODES:
+            raise ValueError(f"Invalid parallel mode {parallel!r}. "
+                             f"Must be one of {self._PARALLEL_MODES}")
+        if processes < 1:
+            raise ValueError("processes must be at least 1")
+        if isolate and parallel:
+            raise ValueError("isolate and parallel cannot be combined")
+        if stabilize and (isolate or parallel):
+            raise ValueError("stabilize only applies to serial in-process runs "
+                             "and cannot be combined with isolate or parallel")
+        if interleaved and (isolate or parallel or auto_calibrate):
+            raise ValueError("interleaved cannot be combined with isolate, parallel "
+                             "or auto_calibrate")
+        if flush_cache and (isolate or parallel or auto_calibrate or interleaved):
+            raise ValueError("flush_cache cannot be combined with isolate, parallel, "
+                             "auto_calibrate or interleaved")
+        
         self.runs = runs
         self.warmup = warmup
+        self.parallel = parallel
+        self.max_workers = max_workers
+        self.isolate = isolate
+        self.processes = processes
+        self.shared_warmup = shared_warmup
+        self.auto_calibrate = auto_calibrate
+        self.target_sample_time = target_sample_time
+        self.stabilize = stabilize
+        self.interleaved = interleaved
+        self.flush_cache = flush_cache
         self.implementations: Dict[str, Callable] = {}
         self.results: Optional[Dict[str, BenchmarkResults]] = None
         self._impl_counter = 0
+        self._name_counts: Dict[str, int] = {}
+        (self._warmup_loop, self._timed_loop, self._batched_loop,
+         self._interleaved_loop, self._flushed_loop) = _compile_loops()
+        # Built on the first run that flushes, so flush_cache can also be
+        # switched on after construction
+        self._flush: Optional[Callable[[], None]] = None
+        self._cache_keys: Dict[str, Hashable] = {}
+        self._cache: Dict[Hashable, Tuple[Sequence[float], DurationStats, int]] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._jit_names: Set[str] = set()
+        self._batch_sizes: Dict[str, int] = {}
+        self._needs_warmup: Set[str] = set()
+        self.compile_times: Dict[str, float] = {}
+        self.timing_overhead_ns: Optional[int] = None
     
-    def add_implementation(self, func: Callable, name: Optional[str] = None) -> "BenchmarkRunner":
+    def add_implementation(self, func: Callable, name: Optional[str] = None,
+                           cache: bool = False,
+                           cache_key: Optional[Hashable] = None,
+                           jit: bool = False, batched: bool = False,
+                           batch_size: Optional[int] = None,
+                           needs_warmup: bool = False) -> "BenchmarkRunner":
         """Add a function implementation to benchmark.
         
         Args:
             func: The function to benchmark
             name: Optional name for the implementation. If not provided,
                   uses func.__name__ or generates a name like 'impl_1'
+            cache: Whether to reuse timings from an earlier run of the same
+                   implementation with the same measurement settings (runs,
+                   warmup, calibration, parallel/isolation, interleaving,
+                   cache flushing and shared warmup). Default: False
+            cache_key: Optional key identifying the implementation in the
+                       cache. Defaults to the function object itself
+            jit: Compile func with ``numba.njit(cache=True)`` and time the
+                 compiled version. Worthwhile for numeric loops whose body
+                 is big enough to amortize Numba's call overhead. Not
+                 available with isolate or process-based parallel runs,
+                 whose workers would compile inside the timing. Default: False
+            batched: func takes an operation count n and performs the
+                     workload n times per call; durations are reported per
+                     operation. Default: False
+            batch_size: Operations per call when batched. Default: 1000
+            needs_warmup: Always give this implementation the full warmup,
+                          even when the runner uses shared_warmup (e.g. for
+                          code with its own JIT or caches to fill). Default: False
         
         Returns:
             Self for method chaining
         
+        Raises:
+            ImportError: If jit is True and numba is not installed
+            ValueError: If batch_size is given without batched, or is less
+                        than 1, or if jit is combined with isolate or
+                        process-based parallel runs
+        
         Example:
             >>> runner = BenchmarkRunner()
             >>> runner.add_implementation(my_func, "optimized")
             >>> runner.add_implementation(other_func)  # Uses function name
+            
+            Workloads of tens of nanoseconds are dominated by the Python
+            call itself, so they are better registered batched:
+            
+            >>> def increment_batched(n):
+            ...     x = 0
+            ...     for _ in range(n):
+            ...         x += 1
+            >>> runner.add_implementation(increment_batched, batched=True,
+            ...                           batch_size=10_000)
         """
+        if jit and (self.isolate or self.parallel in (True, "process")):
+            # Only the parent's dispatcher is compiled before timing; a
+            # worker or child process would compile on its first timed call
+            raise ValueError("jit cannot be combined with isolate or "
+                             "process-based parallel runs")
+        if batch_size is not None and not batched:
+            raise ValueError("batch_size requires batched=True")
+        if batched:
+            batch_size = _DEFAULT_BATCH_SIZE if batch_size is None else batch_size
+            if batch_size < 1:
+                raise ValueError("batch_size must be at least 1")
+        
         if name is None:
             # Try to use function name, fall back to generated name
             if hasattr(func, '__name__') and func.__name__ != '<lambda>':
@@ -57,21 +219,52 @@ class BenchmarkRunner:
                 self._impl_counter += 1
                 name = f"impl_{self._impl_counter}"
         
-        # Ensure unique names
-        original_name = name
-        counter = 1
-        while name in self.implementations:
-            name = f"{original_name}_{counter}"
-            counter += 1
+        # Ensure unique names. The last suffix used for each base name is
+        # remembered, so registering many duplicates doesn't rescan them all
+        if name in self.implementations:
+            original_name = name
+            counter = self._name_counts.get(original_name, 0)
+            while name in self.implementations:
+                counter += 1
+                name = f"{original_name}_{counter}"
+            self._name_counts[original_name] = counter
+        
+        if cache or cache_key is not None:
+            if cache_key is None:
+                cache_key = ("jit", func) if jit else func
+                if batched:
+                    cache_key = ("batched", cache_key, batch_size)
+            self._cache_keys[name] = cache_key
         
+        if jit:
+            func = _numba_jit(func)
+            self._jit_names.add(name)
+        if batched:
+            # Registered as a zero-argument callable like any other; the
+            # batch size is applied when durations are converted
+            func = partial(func, batch_size)
+            self._batch_sizes[name] = batch_size
+        if needs_warmup:
+            self._needs_warmup.add(name)
         self.implementations[name] = func
         return self
     
     def run(self) -> Dict[str, BenchmarkResults]:
         """Run benchmarks for all registered implementations.
         
+        As in benchmark(), garbage collection is disabled and the thread
+        switch interval raised while runs are timed, except with
+        parallel='thread'.
+        
+        Before timing, the fixed cost of one timed sample (timer reads plus
+        an empty call) is measured and stored in timing_overhead_ns. Each
+        result reports it as timing_overhead and overhead_pct, and a warning
+        is logged for results where it exceeds 10% of the mean. It is not
+        subtracted, since the estimate is itself noisy and can exceed the
+        fastest samples.
+        
         Returns:
-            Dictionary mapping implementation names to their BenchmarkResults
+            ResultsDict mapping implementation names to their BenchmarkResults
         
         Raises:
             ValueError: If no implementations have been added
@@ -86,39 +279,296 @@ class BenchmarkRunner:
         if not self.implementations:
             raise ValueError("No implementations added. Use add_implementation() first.")
         
-        self.results = {}
+        # Read settings into locals once; the loops below use them per
+        # implementation
+        implementations = self.implementations
+        runs = self.runs
+        warmup = self.warmup
+        results = self.results = ResultsDict()
+        self.timing_overhead_ns = overhead_ns = _estimate_overhead()
         
-        for name, func in self.implementations.items():
-            # Warmup runs
-            for _ in range(self.warmup):
-                func()
-            
-            # Timed runs
-            durations = []
-            for _ in range(self.runs):
-                start = time.perf_counter()
-                func()
-                end = time.perf_counter()
-                durations.append(end - start)
+        settings = self._measurement_settings()
+        keys = {name: (key, settings) for name, key in self._cache_keys.items()}
+        pending: Dict[str, Callable] = {}
+        shared: Dict[str, str] = {}
+        claimed: Dict[Hashable, str] = {}
+        
+        # Only implementations without cached timings need to run; ones
+        # sharing a cache key with an earlier implementation reuse its timings
+        for name, func in implementations.items():
+            key = keys.get(name)
+            if key is None:
+                pending[name] = func
+            elif key in self._cache or key in claimed:
+                self.cache_hits += 1
+                if key in claimed:
+                    shared[name] = claimed[key]
+            else:
+                self.cache_misses += 1
+                claimed[key] = name
+                pending[name] = func
+        
+        self._compile_jitted(pending)
+        if pending and self.flush_cache and self._flush is None:
+            self._flush = _make_cache_flusher()
+        
+        # Time every implementation before computing any statistics, so no
+        # bookkeeping runs between one benchmark and the next
+        measured, moments, batch_sizes = self._time_implementations(pending)
+        
+        fresh: Dict[str, DurationStats] = {}
+        for name, durations in measured.items():
+            mean, variance = moments.get(name, (None, None))
+            fresh[name] = compute_stats(durations, mean=mean, variance=variance)
+            if name in keys:
+                self._cache[keys[name]] = (durations, fresh[name], batch_sizes[name])
+        
+        stats: Dict[str, DurationStats] = {}
+        for name in implementations:
+            source = shared.get(name, name)
+            if source in measured:
+                durations, stats[name] = measured[source], fresh[source]
+                batch_size = batch_sizes[source]
+            else:
+                durations, stats[name], batch_size = self._cache[keys[name]]
             
-            self.results[name] = BenchmarkResults(
+            # Copy so callers mutating their results can't corrupt the cache
+            result = results[name] = BenchmarkResults(
                 name=name,
-                durations=durations,
-                runs=self.runs,
-                warmup=self.warmup
+                durations=durations[:],
+                runs=len(durations),
+                warmup=warmup,
+                batch_size=batch_size,
+                timing_overhead=overhead_ns / 1e9 / batch_size,
+                stats=stats[name]
             )
+            if result.overhead_pct > 10:
+                logger.warning("%s: measurement overhead dominates (%.0f%% of the mean); "
+                               "use a larger workload or auto_calibrate=True",
+                               name, result.overhead_pct)
         
-        # Calculate comparisons
-        calculate_comparisons(self.results)
+        # Calculate comparisons from the batch statistics
+        calculate_comparisons(results,
+                              means=[stat.mean for stat in stats.values()],
+                              names=list(stats))
         
-        return self.results
+        return results
+    
+    def _compile_jitted(self, implementations: Dict[str, Callable]) -> None:
+        """Trigger Numba compilation of jitted implementations not yet compiled.
+        
+        Compiling happens on the first call, so each jitted function is
+        called once here, outside any warmup or timed loop, and the time
+        taken is recorded in compile_times.
+        
+        Args:
+            implementations: Dictionary mapping names to functions about to be timed
+        """
+        for name, func in implementations.items():
+            if name not in self._jit_names or name in self.compile_times:
+                continue
+            start = time.perf_counter()
+            func()
+            self.compile_times[name] = time.perf_counter() - start
+            logger.info("Compiled %s in %.3fs", name, self.compile_times[name])
+    
+    def _time_implementations(self, implementations: Dict[str, Callable]
+                              ) -> Tuple[Dict[str, Sequence[float]],
+                                         Dict[str, Tuple[float, float]],
+                                         Dict[str, int]]:
+        """Time each implementation, serially or on an executor.
+        
+        Args:
+            implementations: Dictionary mapping names to functions to time
+        
+        Returns:
+            Tuple of (timings, moments, batch_sizes). timings maps names to
+            per-call durations in seconds; moments maps names to (mean,
+            variance) for the implementations where they were computed
+            alongside the timings; batch_sizes maps names to the number of
+            calls each timed sample covered.
+        """
+        timings: Dict[str, Sequence[float]] = {}
+        moments: Dict[str, Tuple[float, float]] = {}
+        batch_sizes: Dict[str, int] = {}
+        
+        if self.isolate:
+            for name, func in implementations.items():
+                timings[name], batch_sizes[name] = self._time_isolated(
+                    func, self._batch_sizes.get(name, 1))
+            return timings, moments, batch_sizes
+        
+        if not self.parallel:
+            with _pinned_to_one_cpu() if self.stabilize else nullcontext():
+                if self.interleaved:
+                    raw_timings = self._time_interleaved(implementations)
+                else:
+                    raw_timings = self._time_sequential(implementations)
+            for name, (raw, inner) in raw_timings.items():
+                timings[name], mean, variance = _convert_durations(raw, inner)
+                moments[name] = (mean, variance)
+                batch_sizes[name] = inner
+            return timings, moments, batch_sizes
+        
+        # Imported here: concurrent.futures.process alone pulls in most of
+        # multiprocessing, which serial runs never need
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+        executor_class = ThreadPoolExecutor if self.parallel == "thread" else ProcessPoolExecutor
+        settings = (self.runs, self.warmup, self.auto_calibrate, self.target_sample_time,
+                    self.parallel != "thread")
+        with executor_class(max_workers=self.max_workers) as executor:
+            futures = {
+                name: executor.submit(_measure, func, *settings,
+                                      self._batch_sizes.get(name, 1))
+                for name, func in implementations.items()
+            }
+            for name, future in futures.items():
+                timings[name], mean, variance, batch_sizes[name] = future.result()
+                moments[name] = (mean, variance)
+        return timings, moments, batch_sizes
+    
+    def _time_sequential(self, implementations: Dict[str, Callable]
+                         ) -> Dict[str, Tuple[Sequence[int], int]]:
+        """Time implementations in this process, one block of runs after another.
+        
+        Args:
+            implementations: Dictionary mapping names to functions to time
+        
+        Returns:
+            Dictionary mapping names to (durations in nanoseconds, batch size)
+        """
+        # Everything the loop needs is bound to locals once, so the only
+        # work between one implementation's timed runs and the next is
+        # the bookkeeping for the next one
+        runs = self.runs
+        stabilize = self.stabilize
+        auto_calibrate = self.auto_calibrate
+        target_sample_time = self.target_sample_time
+        flush_cache = self.flush_cache
+        flush = self._flush
+        batch_sizes = self._batch_sizes
+        warmup_runs = self._warmup_runs
+        warmup_loop = self._warmup_loop
+        timed_loop = self._timed_loop
+        batched_loop = self._batched_loop
+        flushed_loop = self._flushed_loop
+        
+        raw_timings = {}
+        for index, (name, func) in enumerate(implementations.items()):
+            if stabilize and not _reset_state() and index == 0:
+                logger.warning(_NO_CACHE_DROP_MSG)
+            warmup_loop(func, warmup_runs(index, name))
+            if auto_calibrate:
+                inner = _calibrate(func, target_sample_time)
+                with _quiet_interpreter():
+                    raw = _run_timed_loop(batched_loop, func, runs, inner)
+            elif flush_cache:
+                inner = 1
+                with _quiet_interpreter():
+                    raw = _run_timed_loop(flushed_loop, func, runs, flush)
+            else:
+                inner = 1
+                with _quiet_interpreter():
+                    raw = _run_timed_loop(timed_loop, func, runs)
+            raw_timings[name] = (raw, inner * batch_sizes.get(name, 1))
+        return raw_timings
+    
+    def _time_interleaved(self, implementations: Dict[str, Callable]
+                          ) -> Dict[str, Tuple[Sequence[int], int]]:
+        """Time implementations in this process round robin, one call per round.
+        
+        Every implementation is warmed up first; the timed rounds then
+        alternate between implementations so they share the same noise.
+        
+        Args:
+            implementations: Dictionary mapping names to functions to time
+        
+        Returns:
+            Dictionary mapping names to (durations in nanoseconds, batch size)
+        """
+        logger.info("Interleaving runs of %d implementations", len(implementations))
+        if self.stabilize and not _reset_state():
+            logger.warning(_NO_CACHE_DROP_MSG)
+        
+        funcs = list(implementations.values())
+        for index, (name, func) in enumerate(implementations.items()):
+            self._warmup_loop(func, self._warmup_runs(index, name))
+        with _quiet_interpreter():
+            buffers = self._interleaved_loop(funcs, self.runs)
+        return {name: (raw, self._batch_sizes.get(name, 1))
+                for name, raw in zip(implementations, buffers)}
     
-    def print_comparison(self, sort_by: str = "mean", show_all_stats: bool = True) -> None:
+    def _warmup_runs(self, index: int, name: str) -> int:
+        """Number of warmup runs for the index-th implementation timed in-process.
+        
+        Args:
+            index: Position of the implementation in this run, from 0
+            name: Name of the implementation
+        
+        Returns:
+            Warmup runs to perform before timing it
+        """
+        if not self.shared_warmup or not self.warmup or name in self._needs_warmup:
+            return self.warmup
+        if index == 0:
+            return self.warmup // 2
+        return max(1, self.warmup // 4)
+    
+    def _time_isolated(self, func: Callable,
+                       ops_per_call: int = 1) -> Tuple[Sequence[float], int]:
+        """Time a function in ``self.processes`` fresh subprocesses.
+        
+        Args:
+            func: The function to benchmark
+            ops_per_call: Operations one call performs (batched implementations)
+        
+        Returns:
+            Tuple of (durations in seconds from all subprocesses in run
+            order, largest batch size any subprocess calibrated to)
+        
+        Raises:
+            TypeError: If func cannot be pickled
+            RuntimeError: If a subprocess fails
+        """
+        import json
+        import pickle
+        import subprocess
+        
+        try:
+            payload = pickle.dumps((func, self.runs, self.warmup,
+                                    self.auto_calibrate, self.target_sample_time,
+                                    ops_per_call))
+        except (pickle.PicklingError, AttributeError, TypeError) as e:
+            raise TypeError(
+                f"isolate=True requires a picklable, importable function: {e}"
+            ) from e
+        
+        # Give the child our import path so it can resolve func by name
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        command = [sys.executable, "-c", "from benchrun._worker import main; main()"]
+        
+        durations = array("d")
+        batch_size = 1
+        for _ in range(self.processes):
+            proc = subprocess.run(command, input=payload, env=env,
+                                  capture_output=True)
+            if proc.returncode != 0:
+                raise RuntimeError(
+                    f"Isolated benchmark process failed:\n{proc.stderr.decode()}"
+                )
+            output = json.loads(proc.stdout)
+            durations.extend(output["durations"])
+            batch_size = max(batch_size, output["batch_size"])
+        return durations, batch_size
+    
+    def print_comparison(self, sort_by: str = "mean", show_all_stats: bool = True,
+                         file: Optional[TextIO] = None) -> None:
         """Print a comparison table of all benchmark results.
         
         Args:
             sort_by: Metric to sort by ('mean', 'median', 'min', 'max'). Default: 'mean'
             show_all_stats: Whether to show all statistics or just key metrics. Default: True
+            file: Stream to write to. Default: sys.stdout
         
         Raises:
             ValueError: If run() hasn't been called yet
@@ -134,7 +584,8 @@ class BenchmarkRunner:
             raise ValueError("No results available. Call run() first.")
         
         from benchrun.display import print_comparison
-        print_comparison(self.results, sort_by=sort_by, show_all_stats=show_all_stats)
+        print_comparison(self.results, sort_by=sort_by, show_all_stats=show_all_stats,
+                         file=file)
     
     def get_results(self) -> Optional[Dict[str, BenchmarkResults]]:
         """Get the benchmark results.
@@ -167,4 +618,105 @@ class BenchmarkRunner:
         """
         self.implementations.clear()
         self.results = None
-        self._impl_counter = 0
\ No newline at end of file
+        self._impl_counter = 0
+        self._name_counts.clear()
+        self._cache_keys.clear()
+        self._jit_names.clear()
+        self._batch_sizes.clear()
+        self._needs_warmup.clear()
+        self.compile_times.clear()
+    
+    def _measurement_settings(self) -> Tuple[Hashable, ...]:
+        """Every runner setting that affects timings, for use in cache keys."""
+        return (self.runs, self.warmup, self.auto_calibrate, self.target_sample_time,
+                self.parallel, self.max_workers, self.isolate, self.processes,
+                self.stabilize, self.interleaved, self.flush_cache, self.shared_warmup)
+    
+    def clear_cache(self) -> None:
+        """Drop all cached timings and reset the hit/miss counters.
+        
+        Cached timings survive clear(), so implementations added again
+        after a reset are not re-run. Call this to force fresh timings.
+        """
+        self._cache.clear()
+        self.cache_hits = 0
+        self.cache_misses = 0
+    
+    @property
+    def cache_hit_ratio(self) -> float:
+        """Fraction of cache lookups in run() that reused earlier timings.
+        
+        Returns:
+            Ratio of hits to lookups, or 0.0 if nothing was looked up
+        """
+        lookups = self.cache_hits + self.cache_misses
+        return self.cache_hits / lookups if lookups else 0.0
+
+
+def _numba_jit(func: Callable) -> Callable:
+    """Wrap func with numba.njit(cache=True), importing numba lazily.
+    
+    Args:
+        func: Function to compile
+    
+    Returns:
+        The Numba dispatcher for func (compiled on its first call)
+    
+    Raises:
+        ImportError: If numba is not installed
+    """
+    try:
+        import numba
+    except ImportError as e:
+        raise ImportError(
+            "jit=True requires numba. Install it with: pip install benchrun[jit]"
+        ) from e
+    return numba.njit(cache=True)(func)
+
+
+@contextmanager
+def _pinned_to_one_cpu() -> Iterator[None]:
+    """Pin the current process to its highest-numbered allowed CPU.
+    
+    Keeps the scheduler from migrating the benchmark between cores (and
+    their caches) mid-run. The original affinity is restored on exit. On
+    platforms without sched_setaffinity this does nothing.
+    """
+    if not hasattr(os, "sched_setaffinity"):
+        logger.warning("CPU pinning is not supported on this platform")
+        yield
+        return
+    
+    original = os.sched_getaffinity(0)
+    os.sched_setaffinity(0, {max(original)})
+    try:
+        yield
+    finally:
+        os.sched_setaffinity(0, original)
+
+
+def _drop_page_cache() -> bool:
+    """Flush dirty pages and drop the Linux page cache.
+    
+    Returns:
+        True if the cache was dropped, False if not permitted or supported
+    """
+    if not hasattr(os, "geteuid") or os.geteuid() != 0:
+        return False
+    try:
+        os.sync()
+        with open("/proc/sys/vm/drop_caches", "w") as f:
+            f.write("3\n")
+    except OSError:
+        return False
+    return True
+
+
+def _reset_state() -> bool:
+    """Bring the process to the same cold starting state before an implementation.
+    
+    Returns:
+        True if the page cache was dropped as part of the reset
+    """
+    gc.collect()
+    return _drop_page_cache()
@@ -0,0 +1,55 @@
+"""Example comparing interpreted Python with NumPy and Numba-compiled code.
+
+Requires NumPy and Numba: pip install benchrun[jit]
+"""
+
+import numpy as np
+
+from benchrun import BenchmarkRunner
+
+
+SIZE = 10_000
+
+
+def double_list_comp():
+    """Double each index using a list comprehension."""
+    return [i * 2 for i in range(SIZE)]
+
+
+def double_numpy():
+    """Double each index with a vectorized NumPy expression."""
+    return np.arange(SIZE) * 2
+
+
+def double_loop():
+    """Double each index with an explicit loop into a NumPy array."""
+    out = np.empty(SIZE)
+    for i in range(SIZE):
+        out[i] = i * 2
+    return out
+
+
+def main():
+    """Run the benchmark comparison."""
+    print(f"Benchmarking interpreted vs native code (size={SIZE})...\n")
+    
+    runner = BenchmarkRunner(runs=200, warmup=20)
+    
+    runner.add_implementation(double_list_comp, "list_comp")
+    runner.add_implementation(double_loop, "python_loop")
+    runner.add_implementation(double_numpy, "numpy_vectorized")
+    # The same loop compiled with numba.njit; it is compiled once before
+    # timing starts, so compilation doesn't count towards its results
+    runner.add_implementation(double_loop, "numba_jit", jit=True)
+    
+    print("Running benchmarks...")
+    runner.run()
+    
+    # The Speedup column shows the gap between interpreter and native code
+    runner.print_comparison(show_all_stats=False)
+    
+    print(f"\nNumba compile time: {runner.compile_times['numba_jit']:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""Tests for the comparison module."""
+
+import pytest
+from benchrun.results import BenchmarkResults, ResultsDict
+from benchrun.comparison import (
+    calculate_comparisons, get_fastest, get_slowest, calculate_speedup,
+    _sorted_items
+)
+
+
+# Test fixtures
+@pytest.fixture
+def results():
+    """Create results with clearly separated mean times."""
+    return {
+        "fast": BenchmarkResults("fast", [0.001, 0.001, 0.001], runs=3, warmup=0),
+        "medium": BenchmarkResults("medium", [0.002, 0.002, 0.002], runs=3, warmup=0),
+        "slow": BenchmarkResults("slow", [0.004, 0.004, 0.004], runs=3, warmup=0),
+    }
+
+
+# Tests for calculate_comparisons
+def test_calculate_comparisons_sets_speedup(results):
+    """Test that speedups are relative to the fastest implementation."""
+    calculate_comparisons(results)
+    
+    assert results["fast"].speedup == pytest.approx(1.0)
+    assert results["medium"].speedup == pytest.approx(0.5)
+    assert results["slow"].speedup == pytest.approx(0.25)
+    assert results["slow"].relative_performance == pytest.approx(25.0)
+
+
+def test_calculate_comparisons_with_precomputed_means(results):
+    """Test that precomputed means are used when given."""
+    names = list(results)
+    means = [results[name].mean for name in names]
+    calculate_comparisons(results, means=means, names=names)
+    
+    assert results["fast"].speedup == pytest.approx(1.0)
+    assert results["slow"].speedup == pytest.approx(0.25)
+
+
+def test_calculate_comparisons_with_empty_dict():
+    """Test that empty results are left alone."""
+    calculate_comparisons({})
+
+
+# Tests for get_fastest / get_slowest
+def test_get_fastest(results):
+    """Test finding the fastest implementation."""
+    assert get_fastest(results) == "fast"
+    assert get_fastest(results, metric="min") == "fast"
+
+
+def test_get_slowest(results):
+    """Test finding the slowest implementation."""
+    assert get_slowest(results) == "slow"
+    assert get_slowest(results, metric="max") == "slow"
+
+
+def test_get_fastest_invalid_metric(results):
+    """Test that an invalid metric raises ValueError."""
+    with pytest.raises(ValueError):
+        get_fastest(results, metric="max")
+
+
+def test_get_fastest_empty_results():
+    """Test that empty results raise ValueError."""
+    with pytest.raises(ValueError):
+        get_fastest({})
+    with pytest.raises(ValueError):
+        get_slowest({})
+
+
+# Tests for calculate_speedup
+def test_calculate_speedup(results):
+    """Test speedup between two results."""
+    assert calculate_speedup(results["slow"], results["fast"]) == pytest.approx(4.0)
+
+
+# Tests for ResultsDict sort caching
+def test_results_dict_sorted_names(results):
+    """Test that ResultsDict sorts names and reuses the order."""
+    cached = ResultsDict(results)
+    names = cached.sorted_names("mean")
+    
+    assert names == ["fast", "medium", "slow"]
+    assert cached.sorted_names("mean") is names
+    assert [name for name, _ in _sorted_items(cached, "max")] == names
+
+
+def test_results_dict_invalidates_on_mutation(results):
+    """Test that modifying a ResultsDict drops cached orders."""
+    cached = ResultsDict(results)
+    cached.sorted_names("mean")
+    cached["fastest"] = BenchmarkResults("fastest", [0.0001], runs=1, warmup=0)
+    assert cached.sorted_names("mean")[0] == "fastest"
+    
+    del cached["fastest"]
+    assert cached.sorted_names("mean")[0] == "fast"
+    
+    cached.pop("fast")
+    assert cached.sorted_names("mean") == ["medium", "slow"]
+    
+    merged = cached
+    merged |= {"fast": results["fast"]}
+    assert merged is cached
+    assert cached.sorted_names("mean") == ["fast", "medium", "slow"]
+
+
+def test_calculate_comparisons_records_fastest_name(results):
+    """Test that the fastest name is recorded on a ResultsDict."""
+    cached = ResultsDict(results)
+    calculate_comparisons(cached)
+    
+    assert cached.fastest_name == "fast"
+    assert get_fastest(cached) == "fast"
+    
+    cached["faster"] = BenchmarkResults("faster", [0.0005], runs=1, warmup=0)
+    assert cached.fastest_name is None
+    assert get_fastest(cached) == "faster"
+
+
+def test_results_dict_pickle_round_trip(results):
+    """Test that a ResultsDict survives pickling with its fastest name."""
+    import pickle
+    cached = ResultsDict(results)
+    calculate_comparisons(cached)
+    
+    restored = pickle.loads(pickle.dumps(cached))
+    
+    assert isinstance(restored, ResultsDict)
+    assert list(restored) == list(cached)
+    assert restored.fastest_name == "fast"
+    assert restored.sorted_names("mean") == cached.sorted_names("mean")
+
+
+# Tests for MAD
+def test_mad_ignores_outliers():
+    """Test that MAD stays small when a single run is an outlier."""
+    result = BenchmarkResults("x", [1.0, 1.1, 0.9, 1.0, 50.0], runs=5, warmup=0)
+    assert result.median == 1.0
+    assert result.mad == pytest.approx(0.1)
+    assert result.std_dev > 10
+
+
+def test_get_fastest_breaks_noise_level_ties_by_mad():
+    """Test that means within 2×MAD are tied and the steadier result wins."""
+    noisy = BenchmarkResults("noisy", [0.8, 1.0, 1.2, 0.8, 1.2], runs=5, warmup=0)
+    steady = BenchmarkResults("steady", [1.01, 1.01, 1.01], runs=3, warmup=0)
+    slow = BenchmarkResults("slow", [2.0, 2.0, 2.0], runs=3, warmup=0)
+    results = {"noisy": noisy, "steady": steady, "slow": slow}
+    
+    assert get_fastest(results, break_ties=True) == "steady"
+    assert get_fastest(results, metric="min", break_ties=True) == "noisy"
+
+
+def test_get_fastest_agrees_with_comparisons_by_default():
+    """Test that without break_ties the fastest is the lowest mean everywhere."""
+    a = BenchmarkResults("a", [0.9, 1.0, 1.1], runs=3, warmup=0)
+    b = BenchmarkResults("b", [1.05, 1.05, 1.05], runs=3, warmup=0)
+    results = ResultsDict(a=a, b=b)
+    calculate_comparisons(results)
+    
+    assert get_fastest(results) == "a"
+    assert get_fastest(dict(results)) == "a"
+    assert results.fastest_name == "a"
+    assert a.speedup == 1.0
@@ -2,7 +2,7 @@
 
 import time
 import pytest
-from benchrun.benchmark import benchmark
+from benchrun.benchmark import benchmark, _calibrate, _convert_durations
 
 
 # Test fixtures
@@ -97,12 +97,14 @@ def test_benchmark_with_method():
 # Timing accuracy tests
 def test_timing_accuracy_with_sleep(sleep_func):
     """Test that timing is reasonably accurate using sleep."""
-    durations = benchmark(sleep_func, runs=3)
+    durations = benchmark(sleep_func, runs=5)
     
-    # Each duration should be close to 10ms (0.01s)
-    # Allow for some overhead and timing variance (8ms to 15ms)
+    # sleep() never returns early, so every run takes at least ~10ms, but
+    # on a loaded machine the scheduler can wake it arbitrarily late. Only
+    # the fastest run is expected to be close to 10ms (8ms to 15ms).
     for duration in durations:
-        assert 0.008 < duration < 0.015, f"Duration {duration} outside expected range"
+        assert duration > 0.008, f"Duration {duration} shorter than the sleep"
+    assert min(durations) < 0.015, f"Fastest run {min(durations)} far above 10ms"
 
 
 def test_timing_consistency(simple_func):
@@ -120,13 +122,57 @@ def test_timing_consistency(simple_func):
     assert cv < 0.5, f"Timing too inconsistent: CV={cv}"
 
 
-# Input validation tests - Note: The advanced version doesn't have validation
-# These tests are commented out as the simpler benchmark function doesn't validate
-# def test_non_callable_raises_type_error():
-# def test_invalid_runs_raises_value_error(simple_func):
-# def test_invalid_warmup_raises_value_error(simple_func):
-# def test_non_integer_runs_raises_error(simple_func):
-# def test_non_integer_warmup_raises_error(simple_func):
+# Input validation tests
+def test_non_callable_raises_type_error():
+    """Test that a non-callable func raises TypeError."""
+    with pytest.raises(TypeError, match="callable"):
+        benchmark("not a function", runs=1)
+
+
+def test_invalid_runs_raises_value_error(simple_func):
+    """Test that zero or negative runs raise ValueError."""
+    with pytest.raises(ValueError, match="runs"):
+        benchmark(simple_func, runs=0)
+    with pytest.raises(ValueError, match="runs"):
+        benchmark(simple_func, runs=-5)
+
+
+def test_invalid_warmup_raises_value_error(simple_func):
+    """Test that negative warmup raises ValueError."""
+    with pytest.raises(ValueError, match="warmup"):
+        benchmark(simple_func, runs=1, warmup=-1)
+
+
+def test_non_integer_runs_raises_error(simple_func):
+    """Test that non-integer runs are rejected, including bools."""
+    for runs in (10.5, "10", True):
+        with pytest.raises(ValueError, match="runs"):
+            benchmark(simple_func, runs=runs)
+
+
+def test_non_integer_warmup_raises_error(simple_func):
+    """Test that non-integer warmup is rejected."""
+    for warmup in (1.5, "2"):
+        with pytest.raises(ValueError, match="warmup"):
+            benchmark(simple_func, runs=1, warmup=warmup)
+
+
+def test_integer_like_counts_are_accepted(simple_func):
+    """Test that runs and warmup accept IntEnum members."""
+    from enum import IntEnum
+    
+    class Count(IntEnum):
+        THREE = 3
+    
+    durations = benchmark(simple_func, runs=Count.THREE, warmup=Count.THREE)
+    assert len(durations) == 3
+
+
+def test_numpy_integer_counts_are_accepted(simple_func):
+    """Test that numpy integer scalars work as runs and warmup."""
+    np = pytest.importorskip("numpy")
+    durations = benchmark(simple_func, runs=np.int64(4), warmup=np.int32(1))
+    assert len(durations) == 4
 
 
 # Edge cases
@@ -185,3 +231,183 @@ def test_complete_benchmark_workflow():
     
     assert min_time <= avg_time <= max_time
     assert max_time < 1.0  # Should complete in less than 1 second
+
+
+# Auto-calibration tests
+def test_auto_calibrate_returns_per_call_times():
+    """Test that calibrated batches still report one duration per run."""
+    durations = benchmark(lambda: None, runs=5, auto_calibrate=True,
+                          target_sample_time=0.001)
+    assert len(durations) == 5
+    assert all(isinstance(d, float) for d in durations)
+    # Per-call time of a no-op is far below the batch target
+    assert all(0 < d < 0.001 for d in durations)
+
+
+def test_calibration_doubles_until_target():
+    """Test that calibration picks a single call for slow functions."""
+    def slow():
+        time.sleep(0.002)
+    assert _calibrate(slow, target_sample_time=0.001) == 1
+    inner = _calibrate(lambda: None, target_sample_time=0.0001)
+    assert inner > 1
+    assert inner & (inner - 1) == 0  # power of two
+
+
+def test_calibration_with_zero_probe_doubles_from_one(monkeypatch):
+    """Test that a probe below the timer's resolution doesn't jump ahead."""
+    import sys
+    from array import array
+    core = sys.modules["benchrun.benchmark"]
+    batches = []
+    def batched_loop(func, n, inner):
+        batches.append(inner)
+        return array("q", [inner * 12_500])
+    monkeypatch.setattr(core, "_timed_loop", lambda func, n: array("q", [0]))
+    monkeypatch.setattr(core, "_batched_loop", batched_loop)
+    
+    assert _calibrate(lambda: None, target_sample_time=0.0001) == 8
+    assert batches == [1, 2, 4, 8]
+
+
+def test_auto_batch_batches_sub_microsecond_calls():
+    """Test that a trivial function is timed in batches with auto_batch."""
+    import statistics
+    calls = []
+    durations = benchmark(lambda: calls.append(None), runs=5, auto_batch=True)
+    assert len(durations) == 5
+    assert len(calls) > 100
+    # Individual samples can be inflated by preemption; the median can't
+    assert 0 < statistics.median(durations) < 1e-6
+
+
+def test_auto_batch_probes_past_a_slow_first_call(monkeypatch):
+    """Test that one slow probe doesn't rule batching out."""
+    import sys
+    from array import array
+    core = sys.modules["benchrun.benchmark"]
+    probes = iter([50_000, 40_000, 200])
+    monkeypatch.setattr(core, "_timed_loop", lambda func, n: array("q", [next(probes)]))
+    monkeypatch.setattr(core, "_calibrate", lambda func, target: 64)
+    
+    assert core._auto_batch_size(lambda: None) == 64
+
+
+def test_auto_batch_warms_up_in_batches(monkeypatch):
+    """Test that warmup runs whole batches when calls are batched."""
+    import sys
+    monkeypatch.setattr(sys.modules["benchrun.benchmark"], "_auto_batch_size",
+                        lambda func: 50)
+    calls = []
+    benchmark(lambda: calls.append(None), runs=2, warmup=3, auto_batch=True)
+    # 3 warmup batches plus 2 timed batches of 50 calls each
+    assert len(calls) == (3 + 2) * 50
+
+
+def test_auto_batch_leaves_slow_calls_unbatched():
+    """Test that functions slower than a microsecond get one call per run."""
+    calls = []
+    def slow():
+        calls.append(None)
+        time.sleep(0.002)
+    benchmark(slow, runs=5, auto_batch=True)
+    # Two probes over a millisecond exhaust the probe budget
+    assert len(calls) == 5 + 2
+
+
+def test_auto_batch_off_by_default_times_single_calls():
+    """Test that without auto_batch exactly one call is made per run."""
+    calls = []
+    benchmark(lambda: calls.append(None), runs=5, warmup=2)
+    assert len(calls) == 7
+
+
+# Duration conversion tests
+def test_convert_durations_matches_float_statistics():
+    """Test that integer-sum moments match statistics on the floats."""
+    import statistics
+    raw = [1200, 1350, 990, 1010, 4000, 1100]
+    seconds, mean, variance = _convert_durations(raw)
+    
+    assert seconds.tolist() == [d / 1e9 for d in raw]
+    assert mean == pytest.approx(statistics.fmean(seconds))
+    assert variance == pytest.approx(statistics.variance(seconds))
+
+
+def test_convert_durations_per_call():
+    """Test that batched durations are divided by the batch size."""
+    seconds, mean, variance = _convert_durations([2000], inner=4)
+    assert seconds.tolist() == [pytest.approx(5e-7)]
+    assert mean == pytest.approx(5e-7)
+    assert variance == 0.0
+
+
+def test_debug_logging_reports_progress(simple_func, caplog):
+    """Test that progress is logged in chunks when debug logging is enabled."""
+    import logging
+    with caplog.at_level(logging.DEBUG, logger="benchrun.benchmark"):
+        durations = benchmark(simple_func, runs=105)
+    
+    assert len(durations) == 105
+    progress = [r.getMessage() for r in caplog.records]
+    assert progress[0] == "Completed 10/105 runs"
+    assert progress[-1] == "Completed 105/105 runs"
+
+
+def test_timed_runs_disable_gc_and_thread_switching():
+    """Test that GC and thread switching are suspended only while timing."""
+    import gc
+    import sys
+    interval = sys.getswitchinterval()
+    seen = []
+    def probe():
+        seen.append((gc.isenabled(), sys.getswitchinterval()))
+    
+    benchmark(probe, runs=3, warmup=2, auto_batch=False)
+    
+    # Warmup runs see the normal settings, timed runs the quiet ones
+    assert seen[:2] == [(True, interval)] * 2
+    assert all(not enabled and switch > interval for enabled, switch in seen[2:])
+    assert gc.isenabled()
+    assert sys.getswitchinterval() == interval
+
+
+def test_flushed_loop_flushes_before_each_call(simple_func):
+    """Test that the flushed loop runs the flush once per timed call."""
+    from benchrun.benchmark import _flushed_loop, _make_cache_flusher
+    flush = _make_cache_flusher(size=4096)
+    calls = []
+    durations = _flushed_loop(simple_func, 3, lambda: calls.append(flush()))
+    
+    assert len(calls) == 3
+    assert len(durations) == 3
+
+
+# Compact duration storage tests
+def test_large_run_counts_use_compact_storage(monkeypatch):
+    """Test that raw durations use 32-bit storage above the threshold."""
+    import sys
+    from benchrun.benchmark import _run_timed_loop, _timed_loop
+    monkeypatch.setattr(sys.modules["benchrun.benchmark"], "_COMPACT_RUNS", 10)
+    
+    assert _run_timed_loop(_timed_loop, lambda: None, 10).typecode == "q"
+    assert _run_timed_loop(_timed_loop, lambda: None, 11).itemsize == 4
+
+
+def test_compact_storage_overflow_widens_in_place(monkeypatch, caplog):
+    """Test that an overflowing 32-bit sample widens the buffer without rerunning."""
+    import sys
+    from benchrun.benchmark import _compile_loops
+    core = sys.modules["benchrun.benchmark"]
+    monkeypatch.setattr(core, "_COMPACT_RUNS", 1)
+    ticks = iter([0, 1, 2, 2 + 2**40, 3, 4, 5, 6, 7, 8])
+    monkeypatch.setattr(core.time, "perf_counter_ns", lambda: next(ticks))
+    _, timed_loop, _, _, _ = _compile_loops()
+    
+    calls = []
+    durations = core._run_timed_loop(timed_loop, lambda: calls.append(None), 5)
+    
+    assert durations.typecode == "q"
+    assert list(durations) == [1, 2**40, 1, 1, 1]
+    assert len(calls) == 5
+    assert "64-bit storage" in caplog.text
@@ -348,6 +348,27 @@ def test_create_bar_chart_bar_scaling(multiple_results):
     assert slow_bar_length > fast_bar_length
 
 
+def test_create_bar_chart_aligns_values(multiple_results):
+    """Test that bars are padded so the values line up in one column."""
+    chart = create_bar_chart(multiple_results, metric="mean", width=50)
+    bar_lines = [line for line in chart.split('\n') if "█" in line]
+    
+    value_columns = {line.rindex("  ") for line in bar_lines}
+    assert len(value_columns) == 1
+
+
+def test_create_bar_chart_tiny_value_gets_one_block():
+    """Test that a value far below the maximum still shows a bar."""
+    results = {
+        "tiny": BenchmarkResults(name="tiny", durations=[1e-9], runs=1, warmup=0),
+        "huge": BenchmarkResults(name="huge", durations=[1.0], runs=1, warmup=0),
+    }
+    chart = create_bar_chart(results, width=50)
+    tiny_line = [line for line in chart.split('\n') if line.startswith("tiny")][0]
+    
+    assert tiny_line.count("█") == 1
+
+
 def test_create_bar_chart_with_zero_values():
     """Test create_bar_chart when all values are zero."""
     zero_durations = [0.0, 0.0, 0.0]
@@ -481,3 +502,39 @@ def test_create_bar_chart_returns_string():
     chart = create_bar_chart(results)
     
     assert isinstance(chart, str)
+
+
+def test_format_time_unit_boundaries(single_result):
+    """Test that each unit starts exactly at its power of 1000."""
+    assert single_result.format_time(1.0) == "1.000000s"
+    assert single_result.format_time(0.999) == "999.000ms"
+    assert single_result.format_time(1e-3) == "1.000ms"
+    assert single_result.format_time(1e-6) == "1.000μs"
+    assert single_result.format_time(5e-10) == "0.500ns"
+    assert single_result.format_time(0.0) == "0.000ns"
+
+
+def test_format_time_non_finite(single_result):
+    """Test that non-finite times format instead of raising."""
+    assert single_result.format_time(float("inf")) == "infs"
+    assert single_result.format_time(float("nan")) == "nanns"
+
+
+def test_format_time_negative_zero_is_stable(single_result):
+    """Test that -0.0 formats the same whether or not 0.0 came first."""
+    from benchrun.results import _format_time
+    _format_time.cache_clear()
+    assert single_result.format_time(-0.0) == "0.000ns"
+    assert single_result.format_time(0.0) == "0.000ns"
+
+
+def test_print_comparison_to_file(capsys, multiple_results):
+    """Test that print_comparison can write to a given stream."""
+    import io
+    buf = io.StringIO()
+    print_comparison(multiple_results, file=buf)
+    captured = capsys.readouterr()
+    
+    assert captured.out == ""
+    assert "Benchmark Comparison" in buf.getvalue()
+    assert "Fastest: fast" in buf.getvalue()
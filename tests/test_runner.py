@@ -0,0 +1,450 @@
+"""Tests for the BenchmarkRunner class."""
+
+import pytest
+from benchrun.runner import BenchmarkRunner
+
+
+# Test fixtures
+@pytest.fixture
+def counting_func():
+    """A function that records how many times it has been called."""
+    def func():
+        func.calls += 1
+        return sum(range(100))
+    func.calls = 0
+    return func
+
+
+# Basic functionality tests
+def test_run_returns_result_per_implementation(counting_func):
+    """Test that run() produces one result per implementation."""
+    runner = BenchmarkRunner(runs=10)
+    runner.add_implementation(counting_func, "a")
+    runner.add_implementation(lambda: None, "b")
+    results = runner.run()
+    
+    assert set(results) == {"a", "b"}
+    assert all(len(r.durations) == 10 for r in results.values())
+
+
+def test_run_without_implementations_raises():
+    """Test that run() requires at least one implementation."""
+    with pytest.raises(ValueError):
+        BenchmarkRunner().run()
+
+
+@pytest.mark.parametrize("interleaved", [False, True])
+def test_zero_runs_raises_value_error(counting_func, interleaved):
+    """Test that zero runs is reported as a ValueError, not a crash."""
+    runner = BenchmarkRunner(runs=0, interleaved=interleaved)
+    runner.add_implementation(counting_func, "count")
+    with pytest.raises(ValueError, match="cannot be empty"):
+        runner.run()
+
+
+def test_duplicate_names_get_suffixes():
+    """Test that duplicate names are made unique with numeric suffixes."""
+    runner = BenchmarkRunner()
+    for _ in range(4):
+        runner.add_implementation(lambda: None, "impl")
+    runner.add_implementation(lambda: None, "impl_5")
+    runner.add_implementation(lambda: None, "impl")
+    
+    assert list(runner.implementations) == [
+        "impl", "impl_1", "impl_2", "impl_3", "impl_5", "impl_4"
+    ]
+    runner.add_implementation(lambda: None, "impl")
+    assert "impl_6" in runner.implementations
+
+
+# Cache tests
+def test_cache_reuses_timings(counting_func):
+    """Test that a cached implementation is only executed once."""
+    runner = BenchmarkRunner(runs=10, warmup=2)
+    runner.add_implementation(counting_func, "a", cache=True)
+    first = runner.run()
+    second = runner.run()
+    
+    assert counting_func.calls == 12
+    assert first["a"].durations == second["a"].durations
+    assert runner.cache_hits == 1
+    assert runner.cache_misses == 1
+    assert runner.cache_hit_ratio == 0.5
+
+
+def test_cache_survives_clear(counting_func):
+    """Test that cached timings are reused after clear()."""
+    runner = BenchmarkRunner(runs=5)
+    runner.add_implementation(counting_func, cache=True)
+    runner.run()
+    runner.clear()
+    runner.add_implementation(counting_func, "renamed", cache=True)
+    runner.run()
+    
+    assert counting_func.calls == 5
+
+
+def test_cache_key_depends_on_runs(counting_func):
+    """Test that changing the run count invalidates cached timings."""
+    runner = BenchmarkRunner(runs=5)
+    runner.add_implementation(counting_func, cache=True)
+    runner.run()
+    runner.runs = 7
+    results = runner.run()
+    
+    assert counting_func.calls == 12
+    assert len(results["func"].durations) == 7
+
+
+@pytest.mark.parametrize("setting, value", [
+    ("target_sample_time", 0.01), ("interleaved", True), ("shared_warmup", True),
+    ("parallel", "thread"), ("processes", 2), ("flush_cache", True),
+])
+def test_cache_key_depends_on_measurement_settings(counting_func, setting, value):
+    """Test that changing any measurement setting invalidates cached timings."""
+    runner = BenchmarkRunner(runs=3)
+    runner.add_implementation(counting_func, cache=True)
+    runner.run()
+    setattr(runner, setting, value)
+    runner.run()
+    
+    assert runner.cache_misses == 2
+    assert runner.cache_hits == 0
+
+
+def test_custom_cache_key(counting_func):
+    """Test that implementations sharing a cache_key share timings."""
+    runner = BenchmarkRunner(runs=5)
+    runner.add_implementation(counting_func, "a", cache_key="sum")
+    runner.add_implementation(lambda: None, "b", cache_key="sum")
+    results = runner.run()
+    
+    assert counting_func.calls == 5
+    assert results["a"].durations == results["b"].durations
+
+
+def test_clear_cache(counting_func):
+    """Test that clear_cache() forces fresh timings."""
+    runner = BenchmarkRunner(runs=5)
+    runner.add_implementation(counting_func, cache=True)
+    runner.run()
+    runner.clear_cache()
+    runner.run()
+    
+    assert counting_func.calls == 10
+    assert runner.cache_hit_ratio == 0.0
+
+
+def test_uncached_implementation_is_rerun(counting_func):
+    """Test that implementations are re-run by default."""
+    runner = BenchmarkRunner(runs=5)
+    runner.add_implementation(counting_func)
+    runner.run()
+    runner.run()
+    
+    assert counting_func.calls == 10
+
+
+# Parallel tests
+def module_level_func():
+    """A picklable function for process-based runs."""
+    return sum(range(100))
+
+
+@pytest.mark.parametrize("parallel", [True, "process", "thread"])
+def test_parallel_run(parallel):
+    """Test that parallel modes produce a result per implementation."""
+    runner = BenchmarkRunner(runs=5, warmup=1, parallel=parallel, max_workers=2)
+    runner.add_implementation(module_level_func, "a")
+    runner.add_implementation(module_level_func, "b")
+    results = runner.run()
+    
+    assert set(results) == {"a", "b"}
+    assert all(len(r.durations) == 5 for r in results.values())
+    assert all(r.speedup is not None for r in results.values())
+
+
+def test_thread_parallel_accepts_lambdas():
+    """Test that thread-based runs don't require picklable functions."""
+    runner = BenchmarkRunner(runs=5, parallel="thread")
+    runner.add_implementation(lambda: None, "noop")
+    assert len(runner.run()["noop"].durations) == 5
+
+
+def test_invalid_parallel_mode():
+    """Test that an unknown parallel mode raises ValueError."""
+    with pytest.raises(ValueError):
+        BenchmarkRunner(parallel="gpu")
+
+
+# Isolation tests
+def test_isolated_run():
+    """Test that isolated runs combine durations from every process."""
+    runner = BenchmarkRunner(runs=5, warmup=1, isolate=True, processes=2)
+    runner.add_implementation(module_level_func, "a")
+    results = runner.run()
+    
+    assert len(results["a"].durations) == 10
+    assert results["a"].runs == 10
+    assert all(d > 0 for d in results["a"].durations)
+
+
+def test_isolated_run_rejects_lambdas():
+    """Test that unpicklable functions are rejected with TypeError."""
+    runner = BenchmarkRunner(runs=5, isolate=True)
+    runner.add_implementation(lambda: None, "noop")
+    with pytest.raises(TypeError):
+        runner.run()
+
+
+def test_isolate_argument_validation():
+    """Test that invalid isolation settings raise ValueError."""
+    with pytest.raises(ValueError):
+        BenchmarkRunner(processes=0)
+    with pytest.raises(ValueError):
+        BenchmarkRunner(isolate=True, parallel=True)
+
+
+# Shared warmup tests
+def test_shared_warmup_reduces_later_warmups():
+    """Test that shared warmup shortens warmup after the first implementation."""
+    calls = {"a": 0, "b": 0}
+    def make(name):
+        def func():
+            calls[name] += 1
+        return func
+    
+    runner = BenchmarkRunner(runs=10, warmup=20, shared_warmup=True)
+    runner.add_implementation(make("a"), "a")
+    runner.add_implementation(make("b"), "b")
+    runner.run()
+    
+    assert calls == {"a": 10 + 10, "b": 10 + 5}
+
+
+def test_shared_warmup_keeps_zero_warmup():
+    """Test that shared warmup never adds warmup runs when warmup is 0."""
+    runner = BenchmarkRunner(warmup=0, shared_warmup=True)
+    assert runner._warmup_runs(0, "a") == 0
+    assert runner._warmup_runs(3, "b") == 0
+
+
+# Auto-calibration tests
+def test_auto_calibrate_records_batch_size():
+    """Test that calibrated runs report per-call times and their batch size."""
+    runner = BenchmarkRunner(runs=5, auto_calibrate=True, target_sample_time=0.0005)
+    runner.add_implementation(lambda: None, "noop")
+    result = runner.run()["noop"]
+    
+    assert result.batch_size > 1
+    assert len(result.durations) == 5
+    assert 0 < result.mean < 0.0005
+
+
+def test_default_batch_size_is_one(counting_func):
+    """Test that uncalibrated runs time one call per sample."""
+    runner = BenchmarkRunner(runs=5)
+    runner.add_implementation(counting_func, "count")
+    assert runner.run()["count"].batch_size == 1
+
+
+# JIT tests
+def test_jit_without_numba_raises(monkeypatch):
+    """Test that jit=True gives a clear error when numba is missing."""
+    import sys
+    monkeypatch.setitem(sys.modules, "numba", None)
+    runner = BenchmarkRunner()
+    with pytest.raises(ImportError, match="requires numba"):
+        runner.add_implementation(lambda: None, "noop", jit=True)
+
+
+@pytest.mark.parametrize("options", [{"isolate": True}, {"parallel": True},
+                                     {"parallel": "process"}])
+def test_jit_rejects_process_workers(options):
+    """Test that jit=True is refused where workers would compile during timing."""
+    runner = BenchmarkRunner(**options)
+    with pytest.raises(ValueError, match="jit cannot be combined"):
+        runner.add_implementation(lambda: None, "noop", jit=True)
+
+
+def test_jit_compiles_before_timing():
+    """Test that jitted implementations are compiled once, outside timing."""
+    pytest.importorskip("numba")
+    def loop_sum():
+        total = 0
+        for i in range(1000):
+            total += i
+        return total
+    
+    runner = BenchmarkRunner(runs=5)
+    runner.add_implementation(loop_sum, jit=True)
+    results = runner.run()
+    
+    assert "loop_sum" in runner.compile_times
+    assert results["loop_sum"].runs == 5
+
+
+def test_debug_logging_reports_progress(counting_func, caplog):
+    """Test that runner progress is logged between chunks of runs."""
+    import logging
+    runner = BenchmarkRunner(runs=200)
+    runner.add_implementation(counting_func, "count")
+    with caplog.at_level(logging.DEBUG, logger="benchrun.benchmark"):
+        runner.run()
+    
+    progress = [r.getMessage() for r in caplog.records
+                if r.name == "benchrun.benchmark"]
+    assert progress[0] == "Completed 20/200 runs"
+    assert progress[-1] == "Completed 200/200 runs"
+    assert counting_func.calls == 200
+
+
+# Stabilize tests
+def test_stabilize_restores_gc_and_affinity(counting_func, monkeypatch):
+    """Test that stabilized runs leave GC and CPU affinity as they found them."""
+    import gc
+    import os
+    import benchrun.runner as runner_module
+    monkeypatch.setattr(runner_module, "_drop_page_cache", lambda: True)
+    affinity = os.sched_getaffinity(0) if hasattr(os, "sched_getaffinity") else None
+    
+    gc_states = []
+    def probe():
+        gc_states.append(gc.isenabled())
+    
+    runner = BenchmarkRunner(runs=5, stabilize=True)
+    runner.add_implementation(probe, "probe")
+    runner.add_implementation(counting_func, "count")
+    runner.run()
+    
+    assert gc_states and not any(gc_states)
+    assert gc.isenabled()
+    if affinity is not None:
+        assert os.sched_getaffinity(0) == affinity
+
+
+def test_stabilize_rejects_parallel():
+    """Test that stabilize can't be combined with pooled or isolated runs."""
+    with pytest.raises(ValueError):
+        BenchmarkRunner(stabilize=True, parallel=True)
+    with pytest.raises(ValueError):
+        BenchmarkRunner(stabilize=True, isolate=True)
+
+
+# Interleaving tests
+def test_interleaved_alternates_implementations():
+    """Test that interleaved runs alternate calls between implementations."""
+    order = []
+    runner = BenchmarkRunner(runs=3, warmup=1, interleaved=True)
+    runner.add_implementation(lambda: order.append("a"), "a")
+    runner.add_implementation(lambda: order.append("b"), "b")
+    results = runner.run()
+    
+    assert order == ["a", "b"] + ["a", "b"] * 3
+    assert results["a"].runs == results["b"].runs == 3
+
+
+def test_interleaved_argument_validation():
+    """Test that interleaving is rejected where it can't apply."""
+    with pytest.raises(ValueError):
+        BenchmarkRunner(interleaved=True, parallel="thread")
+    with pytest.raises(ValueError):
+        BenchmarkRunner(interleaved=True, auto_calibrate=True)
+
+
+# Timing overhead tests
+def test_timing_overhead_is_reported(counting_func):
+    """Test that run() measures loop overhead and attaches it to results."""
+    runner = BenchmarkRunner(runs=5)
+    runner.add_implementation(counting_func, "count")
+    result = runner.run()["count"]
+    
+    assert runner.timing_overhead_ns > 0
+    assert result.timing_overhead == pytest.approx(runner.timing_overhead_ns / 1e9)
+    assert 0 < result.overhead_pct < 100
+
+
+def test_dominant_overhead_warns(caplog):
+    """Test that a warning is logged when overhead dominates the timings."""
+    import logging
+    runner = BenchmarkRunner(runs=20)
+    runner.add_implementation(lambda: None, "noop")
+    with caplog.at_level(logging.WARNING, logger="benchrun.runner"):
+        runner.run()
+    assert "measurement overhead dominates" in caplog.text
+
+
+# Batched implementation tests
+def test_batched_implementation_reports_per_operation_time():
+    """Test that batched implementations get their count and per-op times."""
+    counts = []
+    def tiny_op_batched(n):
+        counts.append(n)
+        x = 0
+        for _ in range(n):
+            x += 1
+    
+    runner = BenchmarkRunner(runs=5)
+    runner.add_implementation(tiny_op_batched, batched=True, batch_size=500)
+    result = runner.run()["tiny_op_batched"]
+    
+    assert counts == [500] * 5
+    assert result.batch_size == 500
+    assert result.mean < 1e-5
+
+
+def test_batch_size_requires_batched():
+    """Test that batch_size is rejected for non-batched implementations."""
+    runner = BenchmarkRunner()
+    with pytest.raises(ValueError):
+        runner.add_implementation(lambda: None, batch_size=10)
+    with pytest.raises(ValueError):
+        runner.add_implementation(lambda n: None, batched=True, batch_size=0)
+
+
+def test_needs_warmup_opts_out_of_shared_warmup():
+    """Test that needs_warmup keeps the full warmup under shared_warmup."""
+    calls = {"a": 0, "b": 0}
+    def make(name):
+        def func():
+            calls[name] += 1
+        return func
+    
+    runner = BenchmarkRunner(runs=10, warmup=20, shared_warmup=True)
+    runner.add_implementation(make("a"), "a")
+    runner.add_implementation(make("b"), "b", needs_warmup=True)
+    runner.run()
+    
+    assert calls == {"a": 10 + 10, "b": 10 + 20}
+
+
+# Cache flushing tests
+def test_flush_cache_flushes_before_every_run(counting_func):
+    """Test that flush_cache evicts caches once per timed run."""
+    runner = BenchmarkRunner(runs=4, flush_cache=True)
+    flushes = []
+    runner._flush = lambda: flushes.append(counting_func.calls)
+    runner.add_implementation(counting_func, "count")
+    runner.run()
+    
+    # Each flush happens right before the next timed call
+    assert flushes == [0, 1, 2, 3]
+
+
+def test_flush_cache_enabled_after_construction(counting_func):
+    """Test that switching flush_cache on later builds the flusher on run()."""
+    runner = BenchmarkRunner(runs=2)
+    runner.add_implementation(counting_func, "count")
+    runner.flush_cache = True
+    runner.run()
+    
+    assert runner._flush is not None
+    assert counting_func.calls == 2
+
+
+def test_flush_cache_argument_validation():
+    """Test that flush_cache is rejected outside sequential serial runs."""
+    with pytest.raises(ValueError):
+        BenchmarkRunner(flush_cache=True, interleaved=True)
+    with pytest.raises(ValueError):
+        BenchmarkRunner(flush_cache=True, parallel="thread")